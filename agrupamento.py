@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.metrics import silhouette_score
+from sklearn.neighbors import radius_neighbors_graph
+
+# =============================
+# DBSCAN sobre grafo de vizinhança pré-calculado
+# =============================
+# O grafo de raio (distâncias até eps_max, o maior eps da varredura) é
+# montado uma vez; cada combinação eps/min_samples roda o DBSCAN sobre ele
+# (metric="precomputed"), que só considera as arestas com distância <= eps. Para respostas categóricas
+# codificadas a métrica padrão é Hamming (fração de perguntas diferentes).
+
+METRICA_PADRAO = "hamming"
+
+
+class GrafoVizinhanca:
+    def __init__(self, X: np.ndarray, eps_max: float, metrica=METRICA_PADRAO):
+        """`eps_max`: maior eps da varredura; o grafo guarda só os pares até essa distância."""
+        self.X = np.asarray(X)
+        self.metrica = metrica
+        self.eps_max = eps_max
+        # Distâncias zero (respostas idênticas) ficam como entradas explícitas
+        self.grafo = radius_neighbors_graph(self.X, radius=eps_max, mode="distance",
+                                            metric=metrica, include_self=False)
+
+    def rotular(self, eps: float, min_samples: int) -> np.ndarray:
+        if eps > self.eps_max:
+            raise ValueError(f"eps={eps} maior que o raio do grafo ({self.eps_max})")
+        return DBSCAN(eps=eps, min_samples=min_samples, metric="precomputed").fit_predict(self.grafo)
+
+    def silhueta(self, rotulos: np.ndarray, amostra=2000, seed=42) -> float:
+        ok = rotulos >= 0
+        if len(set(rotulos[ok])) < 2 or ok.sum() <= len(set(rotulos[ok])):
+            return np.nan
+        return silhouette_score(self.X[ok], rotulos[ok], metric=self.metrica,
+                                sample_size=min(amostra, int(ok.sum())), random_state=seed)
+
+    def varrer(self, eps_valores, min_samples_valores, amostra_silhueta=2000) -> pd.DataFrame:
+        """Nº de clusters, fração de ruído e silhueta para cada combinação de parâmetros."""
+        linhas = []
+        for eps in eps_valores:
+            for min_samples in min_samples_valores:
+                rotulos = self.rotular(eps, min_samples)
+                n_clusters = len(set(rotulos)) - (1 if -1 in rotulos else 0)
+                linhas.append({
+                    "eps": float(eps),
+                    "min_samples": int(min_samples),
+                    "clusters": n_clusters,
+                    "ruido": float((rotulos == -1).mean()),
+                    "silhueta": self.silhueta(rotulos, amostra_silhueta),
+                })
+        return pd.DataFrame(linhas)
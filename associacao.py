@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+from colunas import COL_CIDADE, COL_PROFISSAO, COLS_TEXTO
+from dados import COL_DATA
+from esquema import POR_PERGUNTA
+from indices import IndiceBitmap, categorizar
+
+# =============================
+# Mineração de associações com bitsets
+# =============================
+# Cada item ("pergunta = resposta", ou só "pergunta" no modo sim/não) é um
+# vetor de bits empacotado, o mesmo do IndiceBitmap. O suporte de um itemset
+# é a contagem de bits do AND dos seus itens (busca em profundidade, estilo
+# Eclat), então a memória fica limitada aos bitsets do caminho atual.
+# Os itemsets ficam em cache por (suporte, tamanho máximo, subconjunto filtrado).
+
+RESPOSTAS_SIM = ("sim", "sim.")
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(bits: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+else:
+    _BITS_POR_BYTE = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+    def _popcount(bits: np.ndarray) -> np.ndarray:
+        return _BITS_POR_BYTE[bits].sum(axis=-1)
+
+
+def colunas_questionario(df: pd.DataFrame) -> list:
+    """Perguntas de múltipla escolha (sem data, cidade, profissão e respostas abertas).
+
+    Só entram perguntas do esquema: colunas derivadas (ex. Cluster) não são respostas.
+    """
+    fora = {COL_DATA, COL_CIDADE, COL_PROFISSAO, *COLS_TEXTO}
+    return [c for c in df.columns if c in POR_PERGUNTA and c not in fora]
+
+
+class MineradorAssociacoes:
+    def __init__(self, df: pd.DataFrame, colunas, somente_sim=False):
+        colunas = list(colunas)
+        base = categorizar(df[colunas], colunas)
+        indice = IndiceBitmap(base, colunas)
+        self.n_linhas = indice.n_linhas
+        self.n_bytes = indice.n_bytes
+
+        nomes, bits = [], []
+        for col in colunas:
+            if somente_sim:
+                # Um item por pergunta: OR das variações de "sim"
+                sims = [c for c in indice.categorias(col) if str(c).strip().lower() in RESPOSTAS_SIM]
+                if sims:
+                    nomes.append(col)
+                    bits.append(indice.bits_coluna(col, sims))
+                continue
+            for cat in indice.categorias(col):
+                nomes.append(f"{col} = {cat}")
+                bits.append(indice.bits_coluna(col, [cat]))
+        self.itens = nomes
+        self._bits = np.vstack(bits) if bits else np.zeros((0, self.n_bytes), dtype=np.uint8)
+        self._cache = {}
+
+    def _mascara_bits(self, mascara):
+        if mascara is None:
+            return None
+        return np.packbits(np.asarray(mascara, dtype=bool))
+
+    def itemsets(self, min_support: float, mascara=None, max_len=4) -> pd.DataFrame:
+        """Itemsets frequentes no formato do mlxtend (colunas support, itemsets)."""
+        filtro = self._mascara_bits(mascara)
+        chave = (min_support, max_len, None if filtro is None else filtro.tobytes())
+        if chave in self._cache:
+            return self._cache[chave]
+
+        bits = self._bits if filtro is None else self._bits & filtro
+        total = self.n_linhas if filtro is None else int(_popcount(filtro))
+        saida = []
+        if total > 0 and len(bits):
+            min_count = max(1, int(np.ceil(min_support * total)))
+            suportes = _popcount(bits)
+            freq = np.flatnonzero(suportes >= min_count)
+            self._eclat((), bits[freq], freq, suportes[freq], min_count, max_len, saida)
+
+        out = pd.DataFrame(
+            {"support": [s / total for _, s in saida],
+             "itemsets": [frozenset(self.itens[i] for i in itens) for itens, _ in saida]},
+        )
+        self._cache[chave] = out
+        return out
+
+    def _eclat(self, prefixo, bits, ids, suportes, min_count, max_len, saida):
+        for i in range(len(ids)):
+            itemset = prefixo + (ids[i],)
+            saida.append((itemset, int(suportes[i])))
+            if len(itemset) >= max_len or i + 1 >= len(ids):
+                continue
+            inter = bits[i + 1:] & bits[i]
+            sup = _popcount(inter)
+            ok = np.flatnonzero(sup >= min_count)
+            if len(ok):
+                self._eclat(itemset, inter[ok], ids[i + 1:][ok], sup[ok], min_count, max_len, saida)
+
+    def regras(self, min_support: float, min_lift=1.0, mascara=None, max_len=4) -> pd.DataFrame:
+        """Regras antecedente -> consequente com suporte, confiança e lift."""
+        itemsets = self.itemsets(min_support, mascara, max_len)
+        suporte = dict(zip(itemsets["itemsets"], itemsets["support"]))
+        linhas = []
+        for itemset, sup in suporte.items():
+            if len(itemset) < 2:
+                continue
+            itens = sorted(itemset)
+            # Todo subconjunto não vazio e próprio vira antecedente
+            for mascara_sub in range(1, (1 << len(itens)) - 1):
+                ant = frozenset(it for j, it in enumerate(itens) if mascara_sub >> j & 1)
+                cons = itemset - ant
+                confianca = sup / suporte[ant]
+                lift = confianca / suporte[cons]
+                if lift >= min_lift:
+                    linhas.append((ant, cons, suporte[ant], suporte[cons], sup, confianca, lift))
+        return pd.DataFrame(linhas, columns=[
+            "antecedents", "consequents", "antecedent support", "consequent support",
+            "support", "confidence", "lift",
+        ])
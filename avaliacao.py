@@ -0,0 +1,109 @@
+import argparse
+import itertools
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.model_selection import KFold, cross_validate
+
+from dados import DIR_CACHE, assinatura_arquivo, carregar_base
+from modelos import (
+    ALVO_CONSCIENTE, ALVO_GASTO, COLS_PREVISAO, VERSAO_PIPELINE, ajustar_codificacao, alvo_gasto,
+)
+
+# =============================
+# Avaliação cruzada dos modelos de previsão
+# =============================
+# k-fold + uma grade pequena de hiperparâmetros para as duas florestas.
+# Os folds rodam em paralelo (n_jobs) e as árvores de cada floresta também
+# podem rodar em paralelo (n_jobs_arvores). Métricas e tempos por fold vão
+# para um CSV identificado pelo hash da base.
+
+DIR_AVALIACAO = DIR_CACHE / "avaliacao"
+GRADE = {
+    "n_estimators": [100, 300],
+    "max_depth": [None, 8],
+    "min_samples_leaf": [1, 3],
+}
+MODELOS = {
+    "classificador": (RandomForestClassifier, ALVO_CONSCIENTE, {"acuracia": "accuracy", "f1_macro": "f1_macro"}),
+    "regressor": (RandomForestRegressor, ALVO_GASTO, {"mae": "neg_mean_absolute_error", "r2": "r2"}),
+}
+
+
+def combinacoes(grade: dict):
+    chaves = list(grade)
+    for valores in itertools.product(*(grade[c] for c in chaves)):
+        yield dict(zip(chaves, valores))
+
+
+def avaliar(df: pd.DataFrame, k=5, grade=GRADE, n_jobs=-1, n_jobs_arvores=1, seed=42) -> pd.DataFrame:
+    """Uma linha por (modelo, parâmetros, fold) com métricas e tempos de treino/predição."""
+    dados = df.dropna()
+    cod = ajustar_codificacao(df)
+    X = cod.codigos(dados, COLS_PREVISAO)
+    folds = KFold(n_splits=k, shuffle=True, random_state=seed)
+
+    linhas = []
+    for nome, (classe, alvo, metricas) in MODELOS.items():
+        # Gasto em R$ (ponto médio da faixa); consciente como código da resposta
+        y = alvo_gasto(dados) if alvo == ALVO_GASTO else cod.codigos(dados, [alvo])[:, 0]
+        ok = ~np.isnan(y)
+        for params in combinacoes(grade):
+            modelo = classe(random_state=seed, n_jobs=n_jobs_arvores, **params)
+            res = cross_validate(modelo, X[ok], y[ok], cv=folds, scoring=metricas, n_jobs=n_jobs, error_score="raise")
+            for fold in range(k):
+                linha = {"modelo": nome, "parametros": str(params), "fold": fold,
+                         "tempo_treino": res["fit_time"][fold], "tempo_predicao": res["score_time"][fold]}
+                for metrica in metricas:
+                    valor = res[f"test_{metrica}"][fold]
+                    # sklearn maximiza "neg_*"; guardamos o erro positivo
+                    linha[metrica] = -valor if metricas[metrica].startswith("neg_") else valor
+                linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def resumir(resultados: pd.DataFrame) -> pd.DataFrame:
+    """Média e desvio-padrão por modelo/parâmetros."""
+    metricas = [c for c in resultados.columns if c not in ("modelo", "parametros", "fold")]
+    resumo = resultados.groupby(["modelo", "parametros"])[metricas].agg(["mean", "std"])
+    resumo.columns = [f"{m} ({estat})".replace("mean", "média").replace("std", "desvio") for m, estat in resumo.columns]
+    return resumo.reset_index()
+
+
+def caminho_resultados(caminho_base) -> Path:
+    caminho_base = Path(caminho_base)
+    digest = assinatura_arquivo(caminho_base)
+    return DIR_AVALIACAO / f"{caminho_base.stem}-{digest[:16]}-v{VERSAO_PIPELINE}.csv"
+
+
+def carregar_resultados(caminho_base="moda_lilian.csv"):
+    arquivo = caminho_resultados(caminho_base)
+    return pd.read_csv(arquivo) if arquivo.exists() else None
+
+
+def executar(caminho_base="moda_lilian.csv", **kwargs) -> pd.DataFrame:
+    resultados = avaliar(carregar_base(caminho_base), **kwargs)
+    DIR_AVALIACAO.mkdir(parents=True, exist_ok=True)
+    resultados.to_csv(caminho_resultados(caminho_base), index=False)
+    return resultados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validação cruzada dos modelos de previsão.")
+    parser.add_argument("--base", default="moda_lilian.csv")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="folds em paralelo")
+    parser.add_argument("--n-jobs-arvores", type=int, default=1, help="árvores em paralelo em cada floresta")
+    args = parser.parse_args(argv)
+
+    resultados = executar(args.base, k=args.folds, n_jobs=args.n_jobs, n_jobs_arvores=args.n_jobs_arvores)
+    for nome, resultados_modelo in resultados.groupby("modelo"):
+        print(f"\n{nome}")
+        print(resumir(resultados_modelo).dropna(axis=1, how="all").to_string(index=False))
+    print(f"\nResultados por fold em {caminho_resultados(args.base)}")
+
+
+if __name__ == "__main__":
+    main()
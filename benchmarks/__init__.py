@@ -0,0 +1,7 @@
+# =============================
+# Benchmarks da pesquisa com bases sintéticas
+# =============================
+# Uso:  python -m benchmarks --tamanhos 1000 10000 100000 --saida benchmarks/resultados.json
+#       python -m benchmarks --comparar benchmarks/baseline.json
+# sintetico.py gera respondentes a partir das distribuições reais, cenarios.py
+# define as operações medidas e __main__.py mede tempo/memória e compara.
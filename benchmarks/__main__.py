@@ -0,0 +1,122 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.cenarios import CENARIOS, LIMITE_LINHAS, Contexto
+from benchmarks.sintetico import gerar
+from dados import carregar_base
+from texto import tokenizar
+
+TAMANHOS = [1_000, 10_000, 100_000]
+TOLERANCIA = 0.25
+
+
+def medir(funcao, repeticoes=3) -> dict:
+    """Menor tempo entre as repetições e pico de memória alocada (tracemalloc, execução à parte)."""
+    tempos = []
+    for _ in range(repeticoes):
+        tokenizar.cache_clear()  # cada repetição tokeniza do zero
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    tokenizar.cache_clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"segundos": min(tempos), "pico_mb": pico / 2**20}
+
+
+def executar(tamanhos=TAMANHOS, cenarios=None, repeticoes=3, seed=0) -> list:
+    cenarios = list(CENARIOS) if cenarios is None else list(cenarios)
+    real = carregar_base("moda_lilian.csv")
+    resultados = []
+    for n in tamanhos:
+        ctx = Contexto(gerar(n, real, seed))
+        try:
+            for nome in cenarios:
+                linha = {"cenario": nome, "linhas": n}
+                if n > LIMITE_LINHAS.get(nome, np.inf):
+                    linha["pulado"] = True
+                else:
+                    linha.update(medir(CENARIOS[nome](ctx), repeticoes))
+                resultados.append(linha)
+                print(_formatar(linha), flush=True)
+        finally:
+            ctx.fechar()
+    return resultados
+
+
+def _formatar(linha: dict) -> str:
+    if linha.get("pulado"):
+        return f"{linha['cenario']:<18} {linha['linhas']:>9,}  (pulado)"
+    return f"{linha['cenario']:<18} {linha['linhas']:>9,}  {linha['segundos']:9.4f}s  {linha['pico_mb']:9.1f} MB"
+
+
+def comparar(resultados: list, baseline: list, tolerancia=TOLERANCIA) -> pd.DataFrame:
+    """Razão atual/baseline de tempo e memória por cenário e tamanho; `regressao` acima da tolerância."""
+    chaves = ["cenario", "linhas"]
+    atual = pd.DataFrame(resultados).dropna(subset=["segundos"])
+    base = pd.DataFrame(baseline).dropna(subset=["segundos"])
+    tab = atual[chaves + ["segundos", "pico_mb"]].merge(
+        base[chaves + ["segundos", "pico_mb"]], on=chaves, suffixes=("", "_baseline"),
+    )
+    tab["razao_tempo"] = tab["segundos"] / tab["segundos_baseline"]
+    tab["razao_memoria"] = tab["pico_mb"] / tab["pico_mb_baseline"]
+    tab["regressao"] = (tab["razao_tempo"] > 1 + tolerancia) | (tab["razao_memoria"] > 1 + tolerancia)
+    return tab
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Mede os cenários da pesquisa com bases sintéticas.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS)
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--saida", default="benchmarks/resultados.json")
+    parser.add_argument("--comparar", help="JSON de baseline gerado por uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA, help="piora aceita (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    resultados = executar(args.tamanhos, args.cenarios, args.repeticoes, args.seed)
+    saida = {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "seed": args.seed,
+        },
+        "resultados": resultados,
+    }
+    Path(args.saida).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.saida).write_text(json.dumps(saida, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados em {args.saida}")
+
+    if args.comparar:
+        baseline = json.loads(Path(args.comparar).read_text(encoding="utf-8"))["resultados"]
+        tab = comparar(resultados, baseline, args.tolerancia)
+        print(tab[["cenario", "linhas", "razao_tempo", "razao_memoria", "regressao"]]
+              .to_string(index=False, float_format="%.2f"))
+        if tab["regressao"].any():
+            print(f"\n{int(tab['regressao'].sum())} regressões acima de {args.tolerancia:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import tempfile
+from functools import cached_property
+from pathlib import Path
+
+import pandas as pd
+
+from associacao import MineradorAssociacoes, colunas_questionario
+from circularidade import COLS_CIRCULARIDADE, build_indice_circularidade
+from colunas import (
+    COL_2MAO, COL_FREQ, COL_GASTO, COL_GENERO, COL_IDADE, COL_IMPACTO, COL_ODS, COL_TXT_MOTIVA, COLS_FILTRO,
+)
+from cubo import CuboAgregado
+from dados import ler_fonte
+from esquema import FORMATO_DATA, tipar
+from indices import IndiceBitmap
+from matriz_termos import MatrizTermos
+from modelos import ajustar_codificacao, treinar_clusters, treinar_classificador, treinar_regressor
+
+# =============================
+# Cenários medidos
+# =============================
+# Cada cenário recebe o Contexto de um tamanho de base e devolve a função
+# que será cronometrada; o preparo (índice, cubo, arquivos) fica fora da
+# medição e é reaproveitado entre cenários.
+
+MEDIDAS = (COL_GENERO, COL_IDADE, COL_FREQ, COL_GASTO, COL_2MAO, COL_ODS, (COL_IMPACTO, COL_2MAO))
+
+# Acima destes tamanhos o cenário é pulado: o alvo do classificador é a
+# resposta aberta (nº de classes cresce com a base) e o DBSCAN euclidiano
+# sobre poucas combinações distintas gera vizinhanças quadráticas.
+LIMITE_LINHAS = {
+    "classificador": 10_000,
+    "dbscan": 10_000,
+    "regressor": 100_000,
+}
+
+
+class Contexto:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._tmp = tempfile.TemporaryDirectory(prefix="bench-moda-")
+        self.dir = Path(self._tmp.name)
+
+    def fechar(self):
+        self._tmp.cleanup()
+
+    @cached_property
+    def base(self) -> pd.DataFrame:
+        return tipar(self.df, COLS_FILTRO + COLS_CIRCULARIDADE)
+
+    @cached_property
+    def selecoes(self) -> dict:
+        # Metade das respostas de gênero e idade, o resto livre
+        sel = {c: self.indice.categorias(c) for c in COLS_FILTRO}
+        for col in (COL_GENERO, COL_IDADE):
+            sel[col] = sel[col][: max(1, len(sel[col]) // 2)]
+        return sel
+
+    @cached_property
+    def indice(self) -> IndiceBitmap:
+        return IndiceBitmap(self.base, COLS_FILTRO)
+
+    @cached_property
+    def mascara(self):
+        return self.indice.mascara(self.selecoes)
+
+    @cached_property
+    def cubo(self) -> CuboAgregado:
+        return CuboAgregado(self.base, COLS_FILTRO, MEDIDAS)
+
+    @cached_property
+    def termos(self) -> MatrizTermos:
+        return MatrizTermos(self.df)
+
+    @cached_property
+    def codificacao(self):
+        return ajustar_codificacao(self.df)
+
+    @cached_property
+    def csv(self) -> Path:
+        caminho = self.dir / "base.csv"
+        self.df.to_csv(caminho, index=False, date_format=FORMATO_DATA)
+        return caminho
+
+    @cached_property
+    def parquet(self) -> Path:
+        caminho = self.dir / "base.parquet"
+        self.df.to_parquet(caminho, index=False)
+        return caminho
+
+
+def carga_csv(ctx):
+    caminho = ctx.csv
+    return lambda: ler_fonte(caminho)
+
+
+def carga_parquet(ctx):
+    caminho = ctx.parquet
+    return lambda: pd.read_parquet(caminho)
+
+
+def indice(ctx):
+    base = ctx.base
+    return lambda: IndiceBitmap(base, COLS_FILTRO)
+
+
+def filtro(ctx):
+    indice, selecoes = ctx.indice, ctx.selecoes
+    return lambda: indice.mascara(selecoes)
+
+
+def cubo(ctx):
+    base = ctx.base
+    return lambda: CuboAgregado(base, COLS_FILTRO, MEDIDAS)
+
+
+def vc_table(ctx):
+    cubo, selecoes = ctx.cubo, ctx.selecoes
+    return lambda: [cubo.vc_table(m, selecoes) for m in MEDIDAS if not isinstance(m, tuple)]
+
+
+def crosstab(ctx):
+    cubo, selecoes = ctx.cubo, ctx.selecoes
+    return lambda: cubo.crosstab(COL_IMPACTO, COL_2MAO, selecoes, normalize="index")
+
+
+def circularidade(ctx):
+    base = ctx.base
+    return lambda: build_indice_circularidade(base)
+
+
+def termos(ctx):
+    df = ctx.df
+    return lambda: MatrizTermos(df)
+
+
+def frequencias_nuvem(ctx):
+    termos, mascara = ctx.termos, ctx.mascara
+    return lambda: termos.frequencias(COL_TXT_MOTIVA, mascara)
+
+
+def associacoes(ctx):
+    df = ctx.df
+    return lambda: MineradorAssociacoes(df, colunas_questionario(df)).itemsets(0.1)
+
+
+def dbscan(ctx):
+    df, cod = ctx.df, ctx.codificacao
+    return lambda: treinar_clusters(df, cod)
+
+
+def classificador(ctx):
+    df, cod = ctx.df, ctx.codificacao
+    return lambda: treinar_classificador(df, cod)
+
+
+def regressor(ctx):
+    df, cod = ctx.df, ctx.codificacao
+    return lambda: treinar_regressor(df, cod)
+
+
+CENARIOS = {
+    "carga_csv": carga_csv,
+    "carga_parquet": carga_parquet,
+    "indice": indice,
+    "filtro": filtro,
+    "cubo": cubo,
+    "vc_table": vc_table,
+    "crosstab": crosstab,
+    "circularidade": circularidade,
+    "termos": termos,
+    "frequencias_nuvem": frequencias_nuvem,
+    "associacoes": associacoes,
+    "dbscan": dbscan,
+    "classificador": classificador,
+    "regressor": regressor,
+}
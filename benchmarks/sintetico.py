@@ -0,0 +1,55 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from colunas import COLS_TEXTO
+from dados import COL_DATA, carregar_base
+
+# =============================
+# Gerador de respondentes sintéticos
+# =============================
+# As respostas de múltipla escolha são sorteadas linha a linha da base real
+# (mantém as combinações entre perguntas). As respostas abertas são montadas
+# com o vocabulário real: nº de palavras e palavras sorteados com as
+# frequências observadas, e a mesma proporção de respostas em branco.
+
+_RE_PALAVRA = re.compile(r"\w+")
+
+
+def _modelo_texto(series: pd.Series):
+    respostas = series.dropna().astype(str)
+    tokens = respostas.map(_RE_PALAVRA.findall)
+    contagem = pd.Series([w for ts in tokens for w in ts]).value_counts()
+    return {
+        "vazias": 1 - len(respostas) / max(len(series), 1),
+        "tamanhos": tokens.map(len).to_numpy(),
+        "palavras": contagem.index.to_numpy(dtype=object),
+        "pesos": (contagem / contagem.sum()).to_numpy(),
+    }
+
+
+def _gerar_texto(modelo: dict, n: int, rng: np.random.Generator) -> pd.Series:
+    tamanhos = rng.choice(modelo["tamanhos"], size=n)
+    palavras = rng.choice(modelo["palavras"], size=int(tamanhos.sum()), p=modelo["pesos"])
+    fim = np.cumsum(tamanhos)
+    textos = [" ".join(palavras[f - t:f]) for t, f in zip(tamanhos, fim)]
+    out = pd.Series(textos, dtype="string")
+    out[rng.random(n) < modelo["vazias"]] = pd.NA
+    return out
+
+
+def gerar(n: int, base=None, seed=0) -> pd.DataFrame:
+    """Base sintética com `n` linhas, mesmas colunas e tipos de dados.carregar_base."""
+    base = carregar_base("moda_lilian.csv") if base is None else base
+    rng = np.random.default_rng(seed)
+
+    df = base.iloc[rng.integers(0, len(base), size=n)].reset_index(drop=True)
+    for col in COLS_TEXTO:
+        df[col] = _gerar_texto(_modelo_texto(base[col]), n, rng)
+
+    # Carimbos crescentes espalhados no mesmo período da coleta real
+    inicio, fim = base[COL_DATA].min(), base[COL_DATA].max()
+    deslocamentos = np.sort(rng.random(n)) * (fim - inicio).total_seconds()
+    df[COL_DATA] = inicio + pd.to_timedelta(deslocamentos.round(), unit="s")
+    return df
@@ -0,0 +1,150 @@
+import difflib
+import json
+import re
+import threading
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+
+from dados import DIR_CACHE, assinatura_arquivo, gravar_json
+
+# =============================
+# Normalização de cidades + coordenadas
+# =============================
+# As respostas de "cidade e estado" são texto livre ("Osvaldo Cruz - SP",
+# "Salmourāo, S.P.", "adamantina "). Cada valor distinto é resolvido uma vez
+# contra o gazetteer local (dobra de acento/caixa, remoção do estado e
+# correspondência aproximada) e o resultado fica em cache no disco.
+
+GAZETTEER = Path("gazetteer_cidades.csv")
+CACHE_CIDADES = DIR_CACHE / "cidades.json"
+
+SUFIXOS_UF = (
+    "ac", "al", "ap", "am", "ba", "ce", "df", "es", "go", "ma", "mt", "ms", "mg", "pa",
+    "pb", "pr", "pe", "pi", "rj", "rn", "rs", "ro", "rr", "sc", "sp", "se", "to",
+    "s p", "sao paulo", "parana", "rio grande do sul", "minas gerais",
+)
+_RE_NAO_ALFANUM = re.compile(r"[^a-z0-9]+")
+_RE_SUFIXO_UF = re.compile(
+    r"^(?P<cidade>.+?)\s+(?:e\s+)?(?:estado\s+de\s+)?(?:"
+    + "|".join(sorted(SUFIXOS_UF, key=len, reverse=True))
+    + r")$"
+)
+CORTE_SEMELHANCA = 0.8
+
+_resolvidos = None
+_trava = threading.Lock()  # sessões do Streamlit resolvem em threads paralelas
+
+
+def dobrar(txt) -> str:
+    """Minúsculas, sem acento e sem pontuação: 'Salmourāo, S.P.' -> 'salmourao s p'."""
+    if not isinstance(txt, str):
+        return ""
+    sem_acento = unicodedata.normalize("NFKD", txt).encode("ascii", "ignore").decode("ascii")
+    return _RE_NAO_ALFANUM.sub(" ", sem_acento.casefold()).strip()
+
+
+def remover_uf(chave: str) -> str:
+    # Remove sufixos de estado repetidos ("... sp", "... estado de sao paulo"),
+    # mas nunca apaga o nome inteiro ("sao paulo" continua sendo a cidade)
+    while True:
+        m = _RE_SUFIXO_UF.match(chave)
+        if not m:
+            return chave
+        chave = m.group("cidade")
+
+
+def carregar_gazetteer(caminho=GAZETTEER) -> pd.DataFrame:
+    gaz = pd.read_csv(caminho)
+    gaz["chave"] = gaz["Cidade"].map(dobrar)
+    return gaz.set_index("chave")
+
+
+def _ler_cache(assinatura_gaz: str) -> dict:
+    if CACHE_CIDADES.exists():
+        try:
+            cache = json.loads(CACHE_CIDADES.read_text(encoding="utf-8"))
+            if cache.get("gazetteer") == assinatura_gaz:
+                return cache["resolvidos"]
+        except (OSError, ValueError, KeyError):
+            pass
+    return {}
+
+
+def _gravar_cache(assinatura_gaz: str, resolvidos: dict):
+    gravar_json(CACHE_CIDADES, {"gazetteer": assinatura_gaz, "resolvidos": resolvidos}, ensure_ascii=False, indent=1)
+
+
+def _casar(chave: str, nomes: list):
+    if not chave:
+        return None
+    if chave in nomes:
+        return chave
+    parecidos = difflib.get_close_matches(chave, nomes, n=1, cutoff=CORTE_SEMELHANCA)
+    if parecidos:
+        return parecidos[0]
+    # Nome incompleto ("osvaldo"): aceita se só uma cidade começa assim
+    prefixo = [n for n in nomes if len(chave) >= 4 and n.startswith(chave + " ")]
+    if len(prefixo) == 1:
+        return prefixo[0]
+    return None
+
+
+def _estado(caminho_gazetteer):
+    # Gazetteer e resoluções ficam em memória enquanto o arquivo não muda
+    global _resolvidos
+    assinatura_gaz = assinatura_arquivo(caminho_gazetteer)
+    if _resolvidos is None or _resolvidos[0] != assinatura_gaz:
+        _resolvidos = (assinatura_gaz, carregar_gazetteer(caminho_gazetteer), _ler_cache(assinatura_gaz))
+    return _resolvidos
+
+
+def resolver(valores, caminho_gazetteer=GAZETTEER) -> pd.DataFrame:
+    """Cidade/UF/Lat/Lon para cada valor distinto (NaN quando não localizado)."""
+    valores = pd.Index(pd.unique(pd.Series(list(valores), dtype="string").dropna()))
+    with _trava:
+        assinatura_gaz, gaz, resolvidos = _estado(caminho_gazetteer)
+        novos = [v for v in valores if v not in resolvidos]
+        if novos:
+            nomes = gaz.index.tolist()
+            for v in novos:
+                chave = _casar(remover_uf(dobrar(v)), nomes)
+                resolvidos[v] = None if chave is None else gaz.loc[chave, "Cidade"]
+            _gravar_cache(assinatura_gaz, resolvidos)
+        nomes_res = [resolvidos[v] for v in valores]
+
+    out = gaz.set_index("Cidade").reindex(nomes_res)[["UF", "Lat", "Lon"]]
+    out.insert(0, "Cidade", nomes_res)
+    out.index = valores
+    return out
+
+
+def frequencia_cidades(series: pd.Series) -> pd.DataFrame:
+    """Frequência por cidade normalizada, com coordenadas, a partir da coluna bruta."""
+    vc = series.value_counts()
+    vc = vc[vc > 0]
+    colunas = ["Cidade_Normalizada", "UF", "Frequência", "Lat", "Lon"]
+    if vc.empty:
+        return pd.DataFrame(columns=colunas)
+    res = resolver(vc.index.astype(str))
+    res["Frequência"] = vc.to_numpy()
+    res = res.dropna(subset=["Cidade"]).rename(columns={"Cidade": "Cidade_Normalizada"})
+    return _somar_cidades(res)[colunas]
+
+
+def _somar_cidades(tab: pd.DataFrame) -> pd.DataFrame:
+    return (
+        tab.groupby(["Cidade_Normalizada", "UF", "Lat", "Lon"], as_index=False)["Frequência"].sum()
+        .sort_values(["Frequência", "Cidade_Normalizada"], ascending=[False, True], ignore_index=True)
+    )
+
+
+def acumular_cidades(freq: pd.DataFrame, series_nova: pd.Series) -> pd.DataFrame:
+    """Soma à tabela de frequencia_cidades as respostas novas (só elas passam pelo resolver)."""
+    nova = frequencia_cidades(series_nova)
+    if nova.empty:
+        return freq
+    if freq.empty:
+        return nova
+    return _somar_cidades(pd.concat([freq, nova], ignore_index=True))[list(freq.columns)]
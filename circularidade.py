@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from colunas import COL_2MAO, COL_MARCA_SUST, COL_REFORMA
+
+# =============================
+# Índice de circularidade (0–3)
+# =============================
+# As funções encode_* definem a regra para UMA resposta. Elas são avaliadas
+# só uma vez por resposta distinta (categorias da coluna) e o resultado é
+# espalhado para todas as linhas por indexação vetorizada dos códigos.
+
+COLS_CIRCULARIDADE = (COL_REFORMA, COL_MARCA_SUST, COL_2MAO)
+COL_CIRC = "Índice de Circularidade"
+
+CIRC_LABELS = {
+    0: "Baixa (nenhuma prática)",
+    1: "Ocasional (pouca prática)",
+    2: "Média (práticas esporádicas)",
+    3: "Alta (práticas frequentes)",
+}
+
+
+def encode_yes_no(txt: str) -> int:
+    if not isinstance(txt, str):
+        return 0
+    t = txt.strip().lower()
+    if t.startswith("s"):  # sim
+        return 1
+    return 0
+
+
+def encode_reforma(txt: str) -> int:
+    # "Faço isso sempre que posso" é a única resposta afirmativa do formulário
+    if not isinstance(txt, str):
+        return 0
+    t = txt.strip().lower()
+    if t.startswith("s") or t.startswith("faço") or t.startswith("já"):
+        return 1
+    return 0
+
+
+def encode_segunda_mao(txt: str) -> int:
+    if not isinstance(txt, str):
+        return 0
+    t = txt.strip().lower()
+    if "nunca" in t:
+        return 0
+    if "ocas" in t or "às" in t or "as vez" in t or "eventual" in t:
+        return 1
+    if "freq" in t or "sempre" in t:
+        return 2
+    # fallback: conta como ocasional
+    return 1
+
+
+def codificar(series: pd.Series, funcao) -> np.ndarray:
+    """Aplica `funcao` às categorias da coluna e indexa a tabela pelos códigos."""
+    s = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    # O código -1 (resposta ausente) cai na última posição da tabela
+    tabela = np.array(
+        [funcao(c) for c in s.cat.categories] + [funcao(np.nan)],
+        dtype=np.int8,
+    )
+    return tabela[s.cat.codes.to_numpy()]
+
+
+def _codificar_coluna(df: pd.DataFrame, col: str, funcao) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df), dtype=np.int8)
+    return codificar(df[col], funcao)
+
+
+def build_indice_circularidade(df: pd.DataFrame) -> pd.Series:
+    a = _codificar_coluna(df, COL_REFORMA, encode_reforma)
+    b = _codificar_coluna(df, COL_MARCA_SUST, encode_yes_no)
+    c = _codificar_coluna(df, COL_2MAO, encode_segunda_mao)
+    idx = np.clip(a + b + c, 0, 3)
+    return pd.Series(idx, index=df.index, name=COL_CIRC)
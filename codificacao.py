@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from cubo import SEM_RESPOSTA
+from esquema import CAMPOS, ORDINAL
+
+# =============================
+# Especificação única de codificação categórica
+# =============================
+# Os mapeamentos categoria -> código são ajustados uma vez por coluna e
+# guardados; todos os modelos reaproveitam a mesma especificação. Colunas
+# ordinais (faixas) seguem a ordem declarada, as demais a ordem alfabética
+# (mesmo resultado do LabelEncoder). Resposta ausente é uma categoria própria.
+
+ORDENS = {c.pergunta: list(c.ordem) for c in CAMPOS if c.tipo == ORDINAL}
+
+
+def _respostas(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip().fillna(SEM_RESPOSTA)
+
+
+class EspecificacaoCodificacao:
+    def __init__(self, colunas, ordens=ORDENS):
+        self.colunas = list(colunas)
+        self.ordens = {c: list(o) for c, o in ordens.items() if c in self.colunas}
+        self.categorias = {}
+
+    def ajustar(self, df: pd.DataFrame) -> "EspecificacaoCodificacao":
+        for col in self.colunas:
+            observadas = sorted(_respostas(df[col]).unique())
+            if col in self.ordens:
+                ordem = self.ordens[col]
+                extras = [c for c in observadas if c not in ordem and c != SEM_RESPOSTA]
+                cats = ordem + extras + [SEM_RESPOSTA]
+            else:
+                cats = observadas
+            self.categorias[col] = pd.Index(cats)
+        return self
+
+    def codigos(self, df: pd.DataFrame, colunas=None) -> np.ndarray:
+        """Matriz int32 contígua (linhas x colunas); categoria nunca vista -> -1."""
+        colunas = self.colunas if colunas is None else list(colunas)
+        X = np.empty((len(df), len(colunas)), dtype=np.int32)
+        for i, col in enumerate(colunas):
+            X[:, i] = pd.Categorical(_respostas(df[col]), categories=self.categorias[col]).codes
+        return X
+
+    def decodificar(self, col, codigos) -> np.ndarray:
+        return self.categorias[col].to_numpy()[np.asarray(codigos)]
+
+    def one_hot(self, df: pd.DataFrame, colunas=None):
+        """Matriz esparsa 0/1 (linhas x categorias) e os nomes 'coluna=categoria'."""
+        colunas = self.colunas if colunas is None else list(colunas)
+        X = self.codigos(df, colunas)
+        deslocamentos = np.cumsum([0] + [len(self.categorias[c]) for c in colunas])
+        validos = X >= 0
+        linhas = np.nonzero(validos)[0]
+        cols = (X + deslocamentos[:-1])[validos]
+        mat = sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.uint8), (linhas, cols)),
+            shape=(len(df), deslocamentos[-1]),
+        )
+        nomes = [f"{c}={cat}" for c in colunas for cat in self.categorias[c]]
+        return mat, nomes
@@ -0,0 +1,32 @@
+from esquema import pergunta
+
+# =============================
+# Colunas principais da pesquisa (perguntas canônicas do registro em esquema.py)
+# =============================
+COL_GENERO = pergunta("genero")
+COL_IDADE = pergunta("idade")
+COL_ESCOLAR = pergunta("escolaridade")
+COL_RENDA = pergunta("renda")
+COL_CIDADE = pergunta("cidade")
+COL_PROFISSAO = pergunta("profissao")
+COL_FREQ = pergunta("frequencia")
+COL_REFORMA = pergunta("reforma")
+COL_MARCA_SUST = pergunta("marca_sustentavel")
+COL_GASTO = pergunta("gasto")
+COL_2MAO = pergunta("segunda_mao")
+COL_IMPACTO = pergunta("impacto")
+COL_ODS = pergunta("ods")
+COL_CIRCULAR = pergunta("circular")
+COL_ALUGUEL = pergunta("aluguel")
+COL_PAGAR_MAIS = pergunta("pagar_mais")
+COL_LOJA = pergunta("loja")
+COL_INFLUENCIA = pergunta("influencia")
+COL_MOTIVACAO = pergunta("motivacao")
+
+# Perguntas abertas (texto livre)
+COL_TXT_MOTIVA = COL_MOTIVACAO
+COL_TXT_CONSCIENTE = pergunta("consciente")
+COL_TXT_MARCAS = pergunta("marcas")
+
+COLS_FILTRO = (COL_GENERO, COL_IDADE, COL_ESCOLAR, COL_RENDA, COL_CIDADE)
+COLS_TEXTO = (COL_TXT_MOTIVA, COL_TXT_CONSCIENTE, COL_TXT_MARCAS)
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# =============================
+# Cubo de contagens para vc_table / crosstab
+# =============================
+# Para cada pergunta analisada guardamos as contagens por combinação das
+# dimensões de filtro + resposta. Uma tabela filtrada é só a soma das fatias
+# do cubo que passam no filtro, sem varrer a base nem normalizar strings de novo.
+
+SEM_RESPOSTA = "(Sem resposta)"
+
+
+def normalizar_respostas(series: pd.Series) -> pd.Series:
+    # Respostas sem espaços nas pontas e ausentes como SEM_RESPOSTA, uma vez por valor distinto
+    s = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    cats = pd.Index(s.cat.categories.astype("string").str.strip())
+    codigos = s.cat.codes.to_numpy()
+    rotulos = np.append(cats.to_numpy(dtype=object), SEM_RESPOSTA)
+    return pd.Series(pd.Categorical(rotulos[codigos]), index=series.index, name=series.name)
+
+
+class CuboAgregado:
+    def __init__(self, df: pd.DataFrame, dimensoes, medidas):
+        """`medidas`: colunas (ou tuplas de colunas, para crosstabs) a agregar."""
+        self.dimensoes = list(dimensoes)
+        self.medidas = list(medidas)
+        self._cubos = self._agregar(df)
+
+    def _agregar(self, df: pd.DataFrame) -> dict:
+        # Linhas sem resposta em alguma dimensão nunca passam pelos filtros
+        completo = df[self.dimensoes].notna().all(axis=1).to_numpy()
+        base = df.loc[completo]
+        cubos = {}
+        for medida in self.medidas:
+            cols = medida if isinstance(medida, tuple) else (medida,)
+            partes = {d: base[d] for d in self.dimensoes}
+            for i, col in enumerate(cols):
+                partes[f"_m{i}"] = normalizar_respostas(base[col])
+            cubos[medida] = (
+                pd.DataFrame(partes)
+                .groupby(list(partes), observed=True)
+                .size()
+                .rename("n")
+                .reset_index()
+            )
+        return cubos
+
+    def acrescentar(self, df_novo: pd.DataFrame):
+        """Soma ao cubo as contagens das linhas novas (custo proporcional a elas e ao tamanho do cubo)."""
+        cubos = {}
+        for medida, novo in self._agregar(df_novo).items():
+            chaves = [c for c in novo.columns if c != "n"]
+            junto = pd.concat([self._cubos[medida], novo], ignore_index=True)
+            for c in chaves:
+                # Categorias diferentes entre as partes viram object no concat
+                if not isinstance(junto[c].dtype, pd.CategoricalDtype):
+                    junto[c] = junto[c].astype("category")
+            cubos[medida] = junto.groupby(chaves, observed=True, sort=False)["n"].sum().reset_index()
+        self._cubos = cubos
+
+    def _fatias(self, medida, selecoes: dict) -> pd.DataFrame:
+        cubo = self._cubos[medida]
+        ok = np.ones(len(cubo), dtype=bool)
+        for dim, valores in selecoes.items():
+            ok &= cubo[dim].isin(list(valores)).to_numpy()
+        return cubo.loc[ok]
+
+    def contagens(self, medida, selecoes: dict) -> pd.Series:
+        fatias = self._fatias(medida, selecoes)
+        cols = [c for c in fatias.columns if c.startswith("_m")]
+        counts = fatias.groupby(cols, observed=True)["n"].sum()
+        return counts[counts > 0]
+
+    def vc_table(self, coluna: str, selecoes: dict, normalize=True) -> pd.DataFrame:
+        counts = self.contagens(coluna, selecoes)
+        counts.index = counts.index.astype(str)
+        counts = counts.sort_values(ascending=False, kind="stable")
+        if normalize:
+            pct = (counts / counts.sum() * 100).round(1)
+            out = pd.DataFrame({"Contagem": counts, "%": pct})
+        else:
+            out = pd.DataFrame({"Contagem": counts})
+        out.index.name = "Categoria"
+        return out.reset_index()
+
+    def crosstab(self, linha: str, coluna: str, selecoes: dict, normalize=None) -> pd.DataFrame:
+        counts = self.contagens((linha, coluna), selecoes)
+        tab = counts.unstack(fill_value=0)
+        tab.index = tab.index.astype(str).rename(linha)
+        tab.columns = tab.columns.astype(str).rename(coluna)
+        tab = tab.sort_index().sort_index(axis=1)
+        if normalize == "index":
+            tab = tab.div(tab.sum(axis=1), axis=0)
+        return tab
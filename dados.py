@@ -0,0 +1,158 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from esquema import pergunta, perguntas, resolver_cabecalhos, tipar
+
+# =============================
+# Carregamento compartilhado da base da pesquisa
+# =============================
+# A planilha/CSV é lida uma única vez e gravada em Parquet (colunas tipadas).
+# O cache é identificado pelo hash do arquivo de origem; o mtime/tamanho
+# evitam recalcular o hash quando o arquivo não mudou. Os cabeçalhos passam
+# pelo registro do esquema, e cada tela pode ler só as colunas que usa.
+
+DIR_CACHE = Path(".cache")
+MANIFESTO = DIR_CACHE / "manifesto.json"
+COL_DATA = pergunta("data")
+
+_trava_manifesto = threading.Lock()
+
+
+def limpar_cabecalhos(df: pd.DataFrame) -> pd.DataFrame:
+    """Troca os cabeçalhos da exportação pelas perguntas canônicas (erro se divergirem do esquema)."""
+    return df.rename(columns=resolver_cabecalhos(df.columns))
+
+
+def gravar_atomico(caminho: Path, escrever):
+    """Grava com `escrever(temp)` num temporário da mesma pasta e troca de uma vez (leitores nunca veem meio arquivo)."""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=caminho.parent, prefix=caminho.name, suffix=".tmp")
+    os.close(fd)
+    try:
+        escrever(temp)
+        os.replace(temp, caminho)
+    except BaseException:
+        os.unlink(temp)
+        raise
+
+
+def gravar_json(caminho: Path, dados, **opcoes):
+    gravar_atomico(caminho, lambda temp: Path(temp).write_text(json.dumps(dados, **opcoes), encoding="utf-8"))
+
+
+@contextmanager
+def trava_arquivo(caminho: Path):
+    """Trava exclusiva sobre `caminho` entre processos e threads (arquivo .lock ao lado; não é reentrante)."""
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho.with_name(caminho.name + ".lock"), "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK desiste depois de 10 s; tenta de novo
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _ler_manifesto() -> dict:
+    if not MANIFESTO.exists():
+        return {}
+    try:
+        return json.loads(MANIFESTO.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _hash_arquivo(caminho: Path) -> str:
+    h = hashlib.sha1()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def assinatura_arquivo(caminho) -> str:
+    """Hash do conteúdo do arquivo, reaproveitado enquanto mtime/tamanho não mudam."""
+    caminho = Path(caminho)
+    info = caminho.stat()
+    chave = str(caminho.resolve())
+    registro = _ler_manifesto().get(chave)
+    if registro and registro["mtime_ns"] == info.st_mtime_ns and registro["tamanho"] == info.st_size:
+        return registro["hash"]
+
+    digest = _hash_arquivo(caminho)
+    # Lê de novo sob a trava para não perder registros gravados por outra sessão
+    with _trava_manifesto:
+        manifesto = _ler_manifesto()
+        manifesto[chave] = {"mtime_ns": info.st_mtime_ns, "tamanho": info.st_size, "hash": digest}
+        gravar_json(MANIFESTO, manifesto, indent=2)
+    return digest
+
+
+def ler_fonte(caminho, colunas=None) -> pd.DataFrame:
+    """Lê a exportação; com `colunas` (chaves ou perguntas), só essas colunas são interpretadas."""
+    caminho = Path(caminho)
+    excel = caminho.suffix.lower() in (".xlsx", ".xls")
+    ler = pd.read_excel if excel else pd.read_csv
+    if colunas is None:
+        return tipar(limpar_cabecalhos(ler(caminho)), categorias=False)
+
+    # Valida o cabeçalho inteiro antes de ler as linhas
+    cabecalhos = resolver_cabecalhos(ler(caminho, nrows=0).columns)
+    pedidas = set(perguntas(colunas))
+    usecols = [bruto for bruto, canonica in cabecalhos.items() if canonica in pedidas]
+    return tipar(ler(caminho, usecols=usecols).rename(columns=cabecalhos), categorias=False)
+
+
+def carregar_base(caminho="moda_lilian.csv", colunas=None) -> pd.DataFrame:
+    """Base tipada; com `colunas` (chaves ou perguntas), o Parquet só lê essas colunas."""
+    caminho = Path(caminho)
+    colunas = None if colunas is None else perguntas(colunas)
+    digest = assinatura_arquivo(caminho)
+    arq_cache = DIR_CACHE / f"{caminho.stem}-{digest[:16]}.parquet"
+    if arq_cache.exists():
+        return pd.read_parquet(arq_cache, columns=colunas)
+
+    df = ler_fonte(caminho)
+    gravar_atomico(arq_cache, lambda temp: df.to_parquet(temp, index=False))
+    # Versões antigas do mesmo arquivo só saem depois que a nova está no lugar
+    for antigo in DIR_CACHE.glob(f"{caminho.stem}-*.parquet"):
+        if antigo != arq_cache:
+            antigo.unlink(missing_ok=True)
+    return df if colunas is None else df[colunas]
+
+
+@st.cache_data(show_spinner=False)
+def _carregar_base_cacheada(caminho: str, assinatura: str, colunas) -> pd.DataFrame:
+    return carregar_base(caminho, colunas)
+
+
+def carregar_base_st(caminho="moda_lilian.csv", colunas=None) -> pd.DataFrame:
+    """Acesso para os apps Streamlit: só relê o Parquet quando o arquivo muda."""
+    colunas = None if colunas is None else tuple(colunas)
+    return _carregar_base_cacheada(str(caminho), assinatura_arquivo(caminho), colunas)
@@ -0,0 +1,136 @@
+import difflib
+from dataclasses import dataclass
+
+import pandas as pd
+
+# =============================
+# Registro do esquema da pesquisa
+# =============================
+# Cada pergunta tem uma chave curta e estável, o texto canônico do cabeçalho
+# (espaços e quebras de linha colapsados) e o tipo declarado. Os cabeçalhos de
+# cada exportação são resolvidos uma vez contra este registro: pergunta
+# faltando ou cabeçalho desconhecido é erro na leitura, não na renderização.
+
+CATEGORICA = "categorica"
+ORDINAL = "ordinal"
+TEXTO = "texto"
+DATA = "data"
+FORMATO_DATA = "%d/%m/%Y %H:%M:%S"  # carimbo de data/hora das exportações
+
+
+class ErroEsquema(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Campo:
+    chave: str
+    pergunta: str
+    tipo: str
+    ordem: tuple = ()
+
+
+CAMPOS = (
+    Campo("data", "Carimbo de data/hora", DATA),
+    Campo("idade", "Qual é a sua faixa etária?", ORDINAL, (
+        "Menor de 18 anos", "18 a 24 anos", "25 a 34 anos", "35 a 44 anos", "45 a 54 anos", "55 anos ou mais",
+    )),
+    Campo("genero", "Qual é o seu gênero?", CATEGORICA),
+    Campo("cidade", "Qual a sua cidade e estado?", CATEGORICA),
+    Campo("profissao", "Qual a sua profissão?", TEXTO),
+    Campo("renda", "Qual é sua faixa de renda mensal?", ORDINAL, (
+        "Até R$ 1.000", "De R$ 1.001 a R$ 3.000", "De R$ 3.001 a R$ 5.000",
+        "De R$ 5.001 a R$ 10.000", "Acima de R$ 10.000",
+    )),
+    Campo("escolaridade", "Qual é o seu grau de escolaridade?", CATEGORICA),
+    Campo("frequencia", "Com que frequência você compra roupas novas?", CATEGORICA),
+    Campo("gasto", "Quanto você gasta, em média, com roupas por mês?", ORDINAL, (
+        "Até R$ 100", "De R$ 101 a R$ 300", "De R$ 301 a R$ 500", "Acima de R$ 500",
+    )),
+    Campo("segunda_mao", "Você compra roupas de segunda mão (ex: brechós/desapegos)?", CATEGORICA),
+    Campo("roupas_familia", "Você possui roupas dos seus pais ou outros familiares de quando eles eram mais jovens?",
+          CATEGORICA),
+    Campo("etiquetas", "Você tem o costume de ler as etiquetas das roupas para ver a composição do tecido?",
+          CATEGORICA),
+    Campo("aluguel", "Você costuma alugar roupas para eventos ou ocasiões especiais?", CATEGORICA),
+    Campo("descarte", "Como você costuma descartar roupas que não usa mais?", CATEGORICA),
+    Campo("circular", "Você conhece o conceito de moda circular?", CATEGORICA),
+    Campo("pagar_mais", "Você estaria disposto(a) a pagar mais por roupas feitas de forma sustentável ou com "
+          "materiais reciclados?", CATEGORICA),
+    Campo("loja", "Você gosta de comprar as suas roupas em lojas físicas ou pela internet?", CATEGORICA),
+    Campo("marca_sustentavel", "Você já comprou ou conhece marcas que promovem moda sustentável?", CATEGORICA),
+    Campo("impacto", "Você acredita que o consumo de moda impacta o meio ambiente?", CATEGORICA),
+    Campo("ods", "Você relaciona suas escolhas de vestuário com os Objetivos de Desenvolvimento Sustentável (ODS)?",
+          CATEGORICA),
+    Campo("influencia", "O que influencia sua decisão de compra?", CATEGORICA),
+    Campo("reforma", "Você já reformou alguma peça de roupa antiga para torná-la mais atual?", CATEGORICA),
+    Campo("motivacao", "O que te motiva a comprar roupas novas? (Ex: necessidade, estilo, promoção, rede social, "
+          "entre outros)", TEXTO),
+    Campo("consciente", "Você se considera um(a) consumidor(a) consciente? Por quê?", TEXTO),
+    Campo("marcas", "Qual ou quais são as marcas de roupas que você mais gosta de comprar?", TEXTO),
+)
+ESQUEMA = {c.chave: c for c in CAMPOS}
+POR_PERGUNTA = {c.pergunta: c for c in CAMPOS}
+
+
+def normalizar_cabecalho(txt) -> str:
+    return " ".join(str(txt).split())
+
+
+def pergunta(chave: str) -> str:
+    return ESQUEMA[chave].pergunta
+
+
+def perguntas(colunas) -> list:
+    """Aceita chaves curtas ou perguntas completas e devolve as perguntas canônicas."""
+    saida = []
+    for col in colunas:
+        if col in ESQUEMA:
+            saida.append(ESQUEMA[col].pergunta)
+        elif col in POR_PERGUNTA:
+            saida.append(col)
+        else:
+            raise ErroEsquema(f"Coluna fora do esquema: {col!r}")
+    return saida
+
+
+def resolver_cabecalhos(cabecalhos) -> dict:
+    """{cabeçalho da exportação: pergunta canônica}; erro se faltar ou sobrar pergunta."""
+    mapa = {c: normalizar_cabecalho(c) for c in cabecalhos}
+    desconhecidos = [n for n in mapa.values() if n not in POR_PERGUNTA]
+    faltando = [p for p in POR_PERGUNTA if p not in mapa.values()]
+    if desconhecidos or faltando:
+        linhas = ["Cabeçalhos da exportação não batem com o esquema."]
+        for n in desconhecidos:
+            parecida = difflib.get_close_matches(n, faltando, n=1)
+            dica = f" (parecido com {POR_PERGUNTA[parecida[0]].chave!r})" if parecida else ""
+            linhas.append(f"  desconhecido: {n!r}{dica}")
+        linhas += [f"  faltando: {POR_PERGUNTA[p].chave!r} = {p!r}" for p in faltando]
+        raise ErroEsquema("\n".join(linhas))
+    return mapa
+
+
+def tipar(df: pd.DataFrame, colunas=None, categorias=True) -> pd.DataFrame:
+    """Aplica os tipos declarados (padrão: todas as colunas do esquema presentes em `df`).
+
+    Com `categorias=False` as respostas ficam como texto (forma gravada no
+    cache em Parquet); só o carimbo de data/hora é interpretado.
+    """
+    df = df.copy()
+    colunas = [c for c in df.columns if c in POR_PERGUNTA] if colunas is None else perguntas(colunas)
+    for col in colunas:
+        campo = POR_PERGUNTA[col]
+        s = df[col]
+        if campo.tipo == DATA:
+            if not pd.api.types.is_datetime64_any_dtype(s):
+                df[col] = pd.to_datetime(s, format=FORMATO_DATA, errors="coerce")
+        elif campo.tipo == TEXTO or not categorias:
+            # Algumas células chegam numéricas (ex. cidade "17")
+            df[col] = s.astype("string")
+        elif campo.tipo == ORDINAL:
+            # Faixas fora da ordem declarada vão para o fim, sem perder a resposta
+            extras = sorted(set(s.dropna().astype(str)) - set(campo.ordem))
+            df[col] = pd.Categorical(s, categories=list(campo.ordem) + extras, ordered=True)
+        elif not isinstance(s.dtype, pd.CategoricalDtype):
+            df[col] = s.astype("category")
+    return df
@@ -0,0 +1,78 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# =============================
+# Faixas de valor (gasto, renda) como intervalos numéricos
+# =============================
+# "Até R$ 100", "De R$ 101 a R$ 300", "Acima de R$ 500" viram limite inferior,
+# superior e ponto médio em reais. Cada resposta distinta é interpretada uma
+# vez (lru_cache) e o resultado é espalhado pelas linhas com os códigos da
+# coluna categórica, como no índice de circularidade.
+
+# O lookahead impede que "1000" (milhar sem ponto) pare em "100"
+_RE_VALOR = re.compile(r"R\$\s*(\d{1,3}(?:\.\d{3})*(?:,\d+)?(?!\d)|\d+(?:,\d+)?)")
+# Faixa aberta ("Acima de R$ X") não tem teto: o ponto médio é X vezes este fator
+FATOR_FAIXA_ABERTA = 1.5
+
+
+def _numero(txt: str) -> float:
+    return float(txt.replace(".", "").replace(",", "."))
+
+
+@lru_cache(maxsize=None)
+def interpretar_faixa(txt) -> tuple:
+    """(inferior, superior, ponto médio) em R$; NaN quando a resposta não é uma faixa."""
+    if not isinstance(txt, str):
+        return (np.nan, np.nan, np.nan)
+    t = txt.strip().lower()
+    valores = [_numero(v) for v in _RE_VALOR.findall(txt)]
+    if len(valores) == 2:
+        inferior, superior = sorted(valores)
+    elif len(valores) == 1 and (t.startswith("até") or t.startswith("menos")):
+        inferior, superior = 0.0, valores[0]
+    elif len(valores) == 1 and (t.startswith("acima") or t.startswith("mais")):
+        return (valores[0], np.inf, valores[0] * FATOR_FAIXA_ABERTA)
+    else:
+        return (np.nan, np.nan, np.nan)
+    return (inferior, superior, (inferior + superior) / 2)
+
+
+def _tabela(series: pd.Series):
+    s = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
+    # O código -1 (resposta ausente) cai na última linha da tabela (NaN)
+    tabela = np.array([interpretar_faixa(c) for c in s.cat.categories] + [(np.nan,) * 3], dtype=float)
+    return s, tabela
+
+
+def faixas(series: pd.Series) -> pd.DataFrame:
+    """Colunas inferior/superior/medio (R$) para cada linha da coluna de faixas."""
+    s, tabela = _tabela(series)
+    valores = tabela[s.cat.codes.to_numpy()]
+    return pd.DataFrame(valores, index=series.index, columns=["inferior", "superior", "medio"])
+
+
+def ponto_medio(series: pd.Series) -> np.ndarray:
+    s, tabela = _tabela(series)
+    return tabela[s.cat.codes.to_numpy(), 2]
+
+
+def ordenar_faixas(series: pd.Series) -> pd.Series:
+    """Categórica ordenada pelos limites da faixa (respostas que não são faixa vão para o fim)."""
+    s, tabela = _tabela(series)
+    cats = s.cat.categories
+    ordem = np.lexsort((tabela[:-1, 1], tabela[:-1, 0]))  # NaN ordena por último
+    return pd.Series(
+        pd.Categorical(s, categories=cats[ordem], ordered=True), index=series.index, name=series.name
+    )
+
+
+def media_por_grupo(df: pd.DataFrame, coluna_faixa: str, grupo) -> pd.DataFrame:
+    """Média do ponto médio da faixa (R$) e nº de respostas por grupo."""
+    medio = pd.Series(ponto_medio(df[coluna_faixa]), index=df.index)
+    chave = df[grupo] if isinstance(grupo, str) else grupo
+    out = medio.groupby(chave, observed=True).agg(["mean", "count"])
+    out.columns = ["Média (R$)", "Respostas"]
+    return out.reset_index()
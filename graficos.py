@@ -0,0 +1,126 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import altair as alt
+import pandas as pd
+import pyarrow as pa
+
+# =============================
+# Especificações Vega-Lite dos gráficos do dashboard
+# =============================
+# Os gráficos partem de tabelas agregadas pequenas. A spec (dict Vega-Lite,
+# com os dados já em Arrow) fica num cache indexado pelo conteúdo da tabela e
+# pelos parâmetros do gráfico: num rerun em que a tabela não mudou não se monta
+# nem se serializa outro alt.Chart. O conjunto de dados recebe o nome do hash
+# do conteúdo, e as perguntas de um mesmo bloco (perfil) vão num só gráfico
+# concatenado sobre uma tabela longa, cada painel filtrando a sua pergunta no
+# navegador, em vez de uma cópia da tabela por gráfico.
+
+MAX_SPECS = 256
+
+_specs = OrderedDict()
+_trava = threading.Lock()
+
+
+def chave_tabela(tb: pd.DataFrame) -> str:
+    h = hashlib.sha1("|".join(map(str, tb.columns)).encode())
+    h.update(pd.util.hash_pandas_object(tb, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _arrow(tb: pd.DataFrame) -> bytes:
+    # Mesmo formato que o Streamlit envia ao front-end (stream IPC do Arrow)
+    tabela = pa.Table.from_pandas(tb, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.RecordBatchStreamWriter(sink, tabela.schema) as escritor:
+        escritor.write_table(tabela)
+    return sink.getvalue().to_pybytes()
+
+
+def especificacao(montar, tb: pd.DataFrame, **params) -> dict:
+    """Spec Vega-Lite de `montar(dados, **params)` para `tb`, reaproveitada do cache."""
+    chave = (montar.__name__, chave_tabela(tb), json.dumps(params, sort_keys=True, default=str))
+    with _trava:
+        if chave in _specs:
+            _specs.move_to_end(chave)
+            return _specs[chave]
+
+    # O Altair infere os tipos e nomeia o conjunto pelo conteúdo; os registros
+    # JSON que ele embute são trocados pela tabela em Arrow
+    spec = montar(tb, **params).to_dict()
+    spec["datasets"] = {nome: _arrow(tb) for nome in spec["datasets"]}
+    with _trava:
+        _specs[chave] = spec
+        while len(_specs) > MAX_SPECS:
+            _specs.popitem(last=False)
+    return spec
+
+
+def mostrar(st, montar, tb: pd.DataFrame, **params):
+    st.vega_lite_chart(especificacao(montar, tb, **params), use_container_width=True)
+
+
+# =============================
+# Tipos de gráfico
+# =============================
+def barras(dados, x="Contagem", y="Categoria", tooltip=("Categoria", "Contagem", "%"), altura=320):
+    return alt.Chart(dados).mark_bar().encode(
+        x=alt.X(f"{x}:Q"),
+        y=alt.Y(f"{y}:N", sort="-x"),
+        tooltip=list(tooltip),
+    ).properties(height=altura)
+
+
+def colunas(dados, x="Categoria", y="Contagem", tooltip=("Categoria", "Contagem", "%"), altura=340):
+    return alt.Chart(dados).mark_bar().encode(
+        x=alt.X(f"{x}:N", sort="-y"),  # Ordena pelo total descendente
+        y=alt.Y(f"{y}:Q"),
+        tooltip=list(tooltip),
+    ).properties(height=altura)
+
+
+def painel_barras(dados, paineis=(), campo="Pergunta", altura=320):
+    """Uma barra horizontal por valor de `campo`, todas lendo o mesmo conjunto de dados."""
+    return alt.vconcat(*[
+        barras(alt.Undefined, altura=altura)
+        .transform_filter(alt.datum[campo] == p)
+        .properties(title=p)
+        for p in paineis
+    ], data=dados).resolve_scale(y="independent")
+
+
+def pizza(dados, altura=360):
+    return alt.Chart(dados).mark_arc(innerRadius=40).encode(
+        theta=alt.Theta(field="%", type="quantitative"),
+        color=alt.Color("Categoria:N"),
+        tooltip=["Categoria", "Contagem", "%"],
+    ).properties(height=altura)
+
+
+def barras_agrupadas(dados, x, cor, y="%", altura=400):
+    return alt.Chart(dados).mark_bar().encode(
+        x=alt.X(f"{x}:N"),
+        y=alt.Y(f"{y}:Q"),
+        color=alt.Color(f"{cor}:N"),
+        tooltip=[x, cor, alt.Tooltip(f"{y}:Q", format=".1f")],
+    ).properties(height=altura)
+
+
+def calor(dados, x, y, ordem_x=alt.Undefined, ordem_y=alt.Undefined, cor="Contagem", altura=300):
+    return alt.Chart(dados).mark_rect().encode(
+        x=alt.X(f"{x}:N", sort=ordem_x),
+        y=alt.Y(f"{y}:N", sort=ordem_y),
+        color=alt.Color(f"{cor}:Q"),
+        tooltip=[y, x, cor],
+    ).properties(height=altura)
+
+
+def linhas(dados, x="Onda", y="%", cor="Categoria", tooltip=("Onda", "Categoria", "Contagem", "%"), altura=320):
+    return alt.Chart(dados).mark_line(point=True).encode(
+        x=alt.X(f"{x}:N"),
+        y=alt.Y(f"{y}:Q"),
+        color=alt.Color(f"{cor}:N"),
+        tooltip=list(tooltip),
+    ).properties(height=altura)
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+# =============================
+# Base categórica + índice bitmap para os filtros
+# =============================
+# Cada resposta de uma coluna de filtro ganha um vetor de bits (1 bit por
+# linha, empacotado em uint8). Uma combinação de filtros vira OR entre os
+# valores escolhidos de cada coluna e AND entre as colunas.
+
+
+def categorizar(df: pd.DataFrame, colunas) -> pd.DataFrame:
+    df = df.copy()
+    for col in colunas:
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    return df
+
+
+def estender_categorias(base: pd.DataFrame, novo: pd.DataFrame, colunas):
+    """Dá a `novo` as categorias de `base`, com as respostas inéditas acrescentadas no fim."""
+    base, novo = base.copy(deep=False), novo.copy()
+    for col in colunas:
+        ineditas = pd.Index(novo[col].dropna().unique()).difference(base[col].cat.categories, sort=False)
+        if len(ineditas):
+            base[col] = base[col].cat.add_categories(ineditas)
+        novo[col] = pd.Categorical(novo[col], dtype=base[col].dtype)
+    return base, novo
+
+
+def _marcar(bits: np.ndarray, codes: np.ndarray, inicio: int):
+    # Liga o bit da linha inicio + i na categoria codes[i]; NaN (-1) não entra em nenhum bitmap
+    validos = codes >= 0
+    lin = np.flatnonzero(validos) + inicio
+    np.bitwise_or.at(
+        bits,
+        (codes[validos], lin >> 3),
+        (np.uint8(0x80) >> (lin & 7)).astype(np.uint8),
+    )
+
+
+class IndiceBitmap:
+    def __init__(self, df: pd.DataFrame, colunas):
+        self.n_linhas = len(df)
+        self.n_bytes = (self.n_linhas + 7) // 8
+        self.colunas = list(colunas)
+        self._categorias = {}
+        self._bits = {}
+
+        for col in self.colunas:
+            s = df[col]
+            if not isinstance(s.dtype, pd.CategoricalDtype):
+                s = s.astype("category")
+            bits = np.zeros((len(s.cat.categories), self.n_bytes), dtype=np.uint8)
+            _marcar(bits, s.cat.codes.to_numpy(), 0)
+            bits.setflags(write=False)  # compartilhado entre sessões: só leitura
+            self._categorias[col] = s.cat.categories
+            self._bits[col] = bits
+
+    def acrescentar(self, df_novo: pd.DataFrame):
+        """Acrescenta linhas no fim; as categorias de `df_novo` estendem as atuais (ver estender_categorias)."""
+        inicio = self.n_linhas
+        n_linhas = inicio + len(df_novo)
+        n_bytes = (n_linhas + 7) // 8
+        categorias, todos_bits = {}, {}
+        for col in self.colunas:
+            cats = df_novo[col].cat.categories
+            antigas = self._categorias[col]
+            if not cats[:len(antigas)].equals(antigas):
+                raise ValueError(f"Categorias de {col!r} não estendem as do índice")
+            bits = np.zeros((len(cats), n_bytes), dtype=np.uint8)
+            bits[:len(antigas), :self.n_bytes] = self._bits[col]
+            _marcar(bits, df_novo[col].cat.codes.to_numpy(), inicio)
+            bits.setflags(write=False)
+            categorias[col] = cats
+            todos_bits[col] = bits
+        # Atributos trocados de uma vez (cópias rasas continuam válidas)
+        self._categorias, self._bits = categorias, todos_bits
+        self.n_linhas, self.n_bytes = n_linhas, n_bytes
+
+    def categorias(self, col) -> list:
+        return self._categorias[col].tolist()
+
+    def bits_coluna(self, col, valores) -> np.ndarray:
+        pos = self._categorias[col].get_indexer(list(valores))
+        pos = pos[pos >= 0]
+        if len(pos) == 0:
+            return np.zeros(self.n_bytes, dtype=np.uint8)
+        return np.bitwise_or.reduce(self._bits[col][pos], axis=0)
+
+    def mascara(self, selecoes: dict) -> np.ndarray:
+        """Máscara booleana das linhas que atendem a todas as seleções {coluna: valores}."""
+        acc = np.full(self.n_bytes, 0xFF, dtype=np.uint8)
+        for col, valores in selecoes.items():
+            acc &= self.bits_coluna(col, valores)
+        return np.unpackbits(acc, count=self.n_linhas).astype(bool)
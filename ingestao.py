@@ -0,0 +1,202 @@
+import argparse
+import copy
+import json
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from dados import (COL_DATA, DIR_CACHE, assinatura_arquivo, carregar_base, gravar_atomico, gravar_json, ler_fonte,
+                   trava_arquivo)
+from colunas import COL_CIDADE
+from cidades import acumular_cidades, frequencia_cidades
+from cubo import CuboAgregado
+from indices import IndiceBitmap, estender_categorias
+from matriz_termos import MatrizTermos
+
+# =============================
+# Ingestão incremental de respostas novas
+# =============================
+# Uso:  python ingestao.py --base moda_lilian.csv [--observar] [arquivos.csv ...]
+# O armazém começa com a exportação completa e cresce só por acréscimo: cada
+# lote (CSV/planilha largado em entrada/<base>/ ou passado na linha de
+# comando) vira uma parte Parquet com as linhas de carimbo de data/hora mais
+# novo que o último já armazenado. A BaseIncremental soma essas linhas ao
+# índice de filtros, ao cubo, à matriz de termos e às cidades, sem refazê-los.
+
+DIR_ARMAZEM = DIR_CACHE / "armazem"
+DIR_ENTRADA = Path("entrada")
+EXTENSOES = (".csv", ".xlsx", ".xls")
+
+
+class Armazem:
+    def __init__(self, caminho_base, diretorio=DIR_ARMAZEM):
+        self.caminho_base = Path(caminho_base)
+        self.dir = Path(diretorio) / self.caminho_base.stem
+        self.arq_estado = self.dir / "estado.json"
+        assinatura = assinatura_arquivo(self.caminho_base)
+        with trava_arquivo(self.arq_estado):
+            self.estado = self._ler_estado()
+            if self.estado.get("semente") != assinatura:
+                self._semear(assinatura)
+
+    def _ler_estado(self) -> dict:
+        if not self.arq_estado.exists():
+            return {}
+        try:
+            return json.loads(self.arq_estado.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar_estado(self):
+        gravar_json(self.arq_estado, self.estado, indent=2, ensure_ascii=False)
+
+    def _semear(self, assinatura: str):
+        # Exportação completa nova: recomeça o armazém a partir dela
+        self.dir.mkdir(parents=True, exist_ok=True)
+        for parte in self.dir.glob("parte-*.parquet"):
+            parte.unlink()
+        df = carregar_base(self.caminho_base)
+        self.estado = {"semente": assinatura, "colunas": list(df.columns), "ultimo_carimbo": None,
+                       "partes": [], "processados": {}}
+        self._gravar_parte(df)
+
+    # Dashboard, relatório e `ingestao.py --observar` podem gravar no mesmo
+    # armazém: quem grava segura a trava do estado e o relê antes de escolher
+    # o nome da próxima parte
+    def _gravar_parte(self, df: pd.DataFrame):
+        nome = f"parte-{len(self.estado['partes']):06d}.parquet"
+        gravar_atomico(self.dir / nome, lambda temp: df.to_parquet(temp, index=False))
+        self.estado["partes"].append(nome)
+        ultimo = df[COL_DATA].max()
+        if pd.notna(ultimo) and (self.ultimo_carimbo is None or ultimo > self.ultimo_carimbo):
+            self.estado["ultimo_carimbo"] = ultimo.isoformat()
+        self._gravar_estado()
+
+    @property
+    def ultimo_carimbo(self):
+        valor = self.estado.get("ultimo_carimbo")
+        return None if valor is None else pd.Timestamp(valor)
+
+    def ler(self, desde=0) -> pd.DataFrame:
+        """Linhas das partes a partir da `desde`-ésima, inclusive as gravadas por outros processos."""
+        self.estado = self._ler_estado() or self.estado
+        partes = [pd.read_parquet(self.dir / nome) for nome in self.estado["partes"][desde:]]
+        if not partes:
+            return pd.DataFrame(columns=self.estado["colunas"])
+        return pd.concat(partes, ignore_index=True)
+
+    def acrescentar(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Grava uma parte nova só com as linhas mais novas que o último carimbo; devolve essas linhas."""
+        with trava_arquivo(self.arq_estado):
+            self.estado = self._ler_estado()
+            return self._acrescentar(df)
+
+    def _acrescentar(self, df: pd.DataFrame) -> pd.DataFrame:
+        colunas = self.estado["colunas"]
+        faltando = [c for c in colunas if c not in df.columns]
+        sobrando = [c for c in df.columns if c not in colunas]
+        if faltando or sobrando:
+            raise ValueError(f"Cabeçalhos diferentes do armazém. Faltando: {faltando}; a mais: {sobrando}")
+
+        df = df[colunas].sort_values(COL_DATA, kind="stable")
+        ultimo = self.ultimo_carimbo
+        novas = df[df[COL_DATA].notna() if ultimo is None else df[COL_DATA] > ultimo]
+        if not novas.empty:
+            self._gravar_parte(novas)
+        return novas.reset_index(drop=True)
+
+    def ingerir(self, arquivos=None) -> pd.DataFrame:
+        """Lê os lotes ainda não processados (padrão: entrada/<base>/) e acrescenta as linhas novas."""
+        if arquivos is None:
+            pasta = DIR_ENTRADA / self.caminho_base.stem
+            arquivos = sorted(p for p in pasta.glob("*") if p.suffix.lower() in EXTENSOES) if pasta.exists() else []
+        with trava_arquivo(self.arq_estado):
+            self.estado = self._ler_estado()
+            lotes, assinaturas = [], {}
+            for arq in map(Path, arquivos):
+                assinatura = assinatura_arquivo(arq)
+                if self.estado["processados"].get(arq.name) == assinatura:
+                    continue
+                lotes.append(ler_fonte(arq))
+                assinaturas[arq.name] = assinatura
+            if not lotes:
+                return pd.DataFrame(columns=self.estado["colunas"])
+
+            novas = self._acrescentar(pd.concat(lotes, ignore_index=True))
+            self.estado["processados"].update(assinaturas)
+            self._gravar_estado()
+            return novas
+
+
+class BaseIncremental:
+    def __init__(self, caminho_base, dimensoes, medidas, preparar=None, arquivos=None):
+        """`preparar`: transformação linha a linha aplicada à base e a cada lote (ex.: categorizar)."""
+        self.armazem = Armazem(caminho_base)
+        self.arquivos = arquivos
+        self._preparar = preparar or (lambda df: df)
+        self._trava = threading.Lock()
+
+        df = self._preparar(self.armazem.ler())
+        self._partes_lidas = len(self.armazem.estado["partes"])
+        self._atual = (
+            df,
+            IndiceBitmap(df, dimensoes),
+            CuboAgregado(df, dimensoes, medidas),
+            MatrizTermos(df),
+            frequencia_cidades(df[COL_CIDADE]),
+        )
+
+    @property
+    def versao(self) -> str:
+        return f"{self.armazem.estado['semente'][:16]}-{len(self._atual[0])}"
+
+    def estruturas(self):
+        """(base, índice, cubo, termos, cidades) da versão atual, compartilhados e somente leitura."""
+        return self._atual
+
+    def atualizar(self) -> int:
+        """Ingere os lotes pendentes; devolve quantas linhas entraram (também as ingeridas por outro processo)."""
+        with self._trava:
+            self.armazem.ingerir(self.arquivos)
+            novas = self.armazem.ler(self._partes_lidas)
+            self._partes_lidas = len(self.armazem.estado["partes"])
+            if novas.empty:
+                return 0
+            df, indice, cubo, termos, cidades = self._atual
+            novas = self._preparar(novas)
+            novas.index = pd.RangeIndex(len(df), len(df) + len(novas))
+            categoricas = [c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)]
+            df, novas = estender_categorias(df, novas, categoricas)
+
+            # Cópias rasas: quem ainda usa a versão anterior não vê a atualização pela metade
+            indice, cubo, termos = copy.copy(indice), copy.copy(cubo), copy.copy(termos)
+            indice.acrescentar(novas)
+            cubo.acrescentar(novas)
+            termos.acrescentar(novas)
+            cidades = acumular_cidades(cidades, novas[COL_CIDADE])
+            self._atual = (pd.concat([df, novas]), indice, cubo, termos, cidades)
+            return len(novas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Acrescenta respostas novas ao armazém da base.")
+    parser.add_argument("arquivos", nargs="*", help=f"lotes a ingerir (padrão: {DIR_ENTRADA}/<base>/)")
+    parser.add_argument("--base", default="moda_lilian.csv")
+    parser.add_argument("--observar", action="store_true", help="fica verificando a pasta de entrada")
+    parser.add_argument("--intervalo", type=float, default=5.0, help="segundos entre verificações")
+    args = parser.parse_args(argv)
+
+    armazem = Armazem(args.base)
+    while True:
+        novas = armazem.ingerir(args.arquivos or None)
+        if len(novas) or not args.observar:
+            print(f"{len(novas)} respostas novas (último carimbo: {armazem.ultimo_carimbo})")
+        if not args.observar:
+            break
+        time.sleep(args.intervalo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# =============================
+# Medição das seções dos apps Streamlit
+# =============================
+# `with medir("perfil") as m:` (ou @medido("perfil")) registra tempo de parede,
+# linhas processadas e, com o tracemalloc ligado, a memória alocada por seção.
+# Os registros ficam por execução do script e por thread (cada sessão do
+# Streamlit roda na sua), aparecem no painel de depuração da barra lateral e,
+# com MODA_LOG_MEDICOES=arquivo.jsonl, são acrescentados num log JSONL.
+# O tracemalloc vale para o processo todo (e deixa todas as sessões mais
+# lentas), então só é ligado na partida, com MODA_MEDIR_MEMORIA=1.
+
+VAR_LOG = "MODA_LOG_MEDICOES"
+VAR_MEMORIA = "MODA_MEDIR_MEMORIA"
+
+if os.environ.get(VAR_MEMORIA) and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+_local = threading.local()
+
+
+def iniciar(app: str):
+    """Começa uma execução nova do script (descarta os registros da anterior)."""
+    _local.app = app
+    _local.execucao = datetime.now().isoformat(timespec="milliseconds")
+    _local.registros = []
+    _local.nivel = 0
+
+
+def registros() -> list:
+    return getattr(_local, "registros", [])
+
+
+@contextmanager
+def medir(secao: str, linhas=None):
+    """Mede o bloco; `linhas` pode ser informado aqui ou depois em `m["linhas"]`."""
+    if not hasattr(_local, "registros"):
+        iniciar("?")
+    registro = {"secao": secao, "nivel": _local.nivel, "linhas": linhas}
+    _local.registros.append(registro)  # na ordem de início, antes das seções internas
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        antes = tracemalloc.get_traced_memory()[0]
+    _local.nivel += 1
+    inicio = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro["segundos"] = time.perf_counter() - inicio
+        _local.nivel -= 1
+        # Só vale se o tracemalloc ficou ligado do começo ao fim do bloco
+        if memoria and tracemalloc.is_tracing():
+            registro["alocado_mb"] = (tracemalloc.get_traced_memory()[0] - antes) / 2**20
+
+
+def medido(secao=None):
+    """Decorador: mede cada chamada; `linhas` = len(resultado) quando houver."""
+    def decorar(funcao):
+        nome = secao or funcao.__name__
+
+        @functools.wraps(funcao)
+        def envolvida(*args, **kwargs):
+            with medir(nome) as registro:
+                resultado = funcao(*args, **kwargs)
+                if registro["linhas"] is None and hasattr(resultado, "__len__"):
+                    registro["linhas"] = len(resultado)
+                return resultado
+        return envolvida
+    return decorar
+
+
+def tabela() -> pd.DataFrame:
+    df = pd.DataFrame(registros(), columns=["secao", "nivel", "linhas", "segundos", "alocado_mb"])
+    # Seções aninhadas aparecem recuadas sob a seção de fora
+    df["secao"] = ["  " * n + s for s, n in zip(df["secao"], df["nivel"])]
+    return df.drop(columns="nivel")
+
+
+def gravar_jsonl(caminho=None):
+    caminho = caminho or os.environ.get(VAR_LOG)
+    if not caminho or not registros():
+        return
+    with open(Path(caminho), "a", encoding="utf-8") as f:
+        for registro in registros():
+            f.write(json.dumps({"app": _local.app, "execucao": _local.execucao, **registro},
+                               ensure_ascii=False) + "\n")
+
+
+def painel(st):
+    """Expander de depuração na barra lateral com as medições da execução atual."""
+    with st.sidebar.expander("Depuração: tempos por seção", expanded=False):
+        tab = tabela()
+        st.dataframe(tab.round(4), use_container_width=True, hide_index=True)
+        st.caption(f"Total: {tab['segundos'][~tab['secao'].str.startswith(' ')].sum():.3f}s")
+        if not tracemalloc.is_tracing():
+            st.caption(f"Memória alocada: inicie o app com {VAR_MEMORIA}=1.")
+    gravar_jsonl()
@@ -0,0 +1,123 @@
+import argparse
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from dados import carregar_base
+from colunas import (
+    COL_ESCOLAR, COL_GENERO, COL_IDADE, COL_RENDA,
+    COL_TXT_CONSCIENTE, COL_TXT_MARCAS, COL_TXT_MOTIVA,
+)
+from matriz_termos import MatrizTermos
+from servico_nuvem import PARAMETROS_PADRAO, chave_nuvem, renderizar_nuvem
+
+# =============================
+# Geração em lote das nuvens de palavras e tabelas de frequência
+# =============================
+# Uso:  python lote_nuvens.py --saida nuvens --grupos genero idade --workers 4
+# Para cada pergunta aberta x agrupamento (mais a base toda) grava um PNG e
+# um CSV com as N palavras mais citadas, além de um Parquet com todas as
+# tabelas. Artefatos cujo hash de entrada não mudou são pulados.
+
+TEXTOS = {
+    "motivacao": COL_TXT_MOTIVA,
+    "consciente": COL_TXT_CONSCIENTE,
+    "marcas": COL_TXT_MARCAS,
+}
+GRUPOS = {
+    "genero": COL_GENERO,
+    "idade": COL_IDADE,
+    "renda": COL_RENDA,
+    "escolaridade": COL_ESCOLAR,
+}
+MANIFESTO = "manifesto.json"
+
+
+def slug(txt) -> str:
+    return re.sub(r"[^0-9a-zA-ZÀ-ÿ]+", "-", str(txt)).strip("-").lower() or "vazio"
+
+
+def _renderizar_png(caminho: str, freq: dict, parametros: dict) -> str:
+    png = renderizar_nuvem(freq, **parametros)
+    Path(caminho).write_bytes(png)
+    return caminho
+
+
+def montar_tarefas(df: pd.DataFrame, textos, grupos):
+    """(nome do artefato, texto, grupo, valor, frequências) para todo o produto cruzado."""
+    termos = MatrizTermos(df, [TEXTOS[t] for t in textos])
+    for t in textos:
+        col = TEXTOS[t]
+        freq = termos.frequencias(col)
+        yield f"{t}__todos", t, "todos", "todos", freq
+        for g in grupos:
+            por_grupo = termos.por_grupo(col, df[GRUPOS[g]])
+            for valor, linha in por_grupo.iterrows():
+                yield f"{t}__{g}__{slug(valor)}", t, g, valor, linha[linha > 0]
+
+
+def executar(base, saida, textos, grupos, workers=None, top=30, forcar=False) -> dict:
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    arq_manifesto = saida / MANIFESTO
+    manifesto = {} if forcar or not arq_manifesto.exists() else json.loads(arq_manifesto.read_text(encoding="utf-8"))
+
+    df = carregar_base(base, [TEXTOS[t] for t in textos] + [GRUPOS[g] for g in grupos])
+    parametros = dict(PARAMETROS_PADRAO)
+    tabelas = []
+    pendentes = []
+    novo_manifesto = {}
+    for nome, t, g, valor, freq in montar_tarefas(df, textos, grupos):
+        freq = freq.astype("int64")
+        top_n = freq.nlargest(top, keep="first").rename("Frequência").reset_index()
+        top_n.insert(0, "valor", str(valor))
+        top_n.insert(0, "grupo", g)
+        top_n.insert(0, "texto", t)
+        tabelas.append(top_n)
+
+        chave = chave_nuvem(freq, {**parametros, "top": top})
+        novo_manifesto[nome] = chave
+        png, csv = saida / f"{nome}.png", saida / f"{nome}.csv"
+        if manifesto.get(nome) == chave and csv.exists() and (freq.empty or png.exists()):
+            continue
+        top_n.drop(columns=["texto", "grupo", "valor"]).to_csv(csv, index=False)
+        if not freq.empty:
+            pendentes.append((str(png), freq.to_dict(), parametros))
+
+    inicio = time.perf_counter()
+    if pendentes:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_renderizar_png, *zip(*pendentes)))
+
+    if tabelas:
+        pd.concat(tabelas, ignore_index=True).to_parquet(saida / "top_termos.parquet", index=False)
+    arq_manifesto.write_text(json.dumps(novo_manifesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    return {
+        "artefatos": len(novo_manifesto),
+        "renderizados": len(pendentes),
+        "segundos_render": round(time.perf_counter() - inicio, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera nuvens de palavras e tabelas de frequência em lote.")
+    parser.add_argument("--base", default="moda_lilian.csv")
+    parser.add_argument("--saida", default="nuvens")
+    parser.add_argument("--textos", nargs="+", choices=list(TEXTOS), default=list(TEXTOS))
+    parser.add_argument("--grupos", nargs="*", choices=list(GRUPOS), default=["genero", "idade"])
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    parser.add_argument("--top", type=int, default=30, help="palavras por tabela")
+    parser.add_argument("--forcar", action="store_true", help="ignora o manifesto e refaz tudo")
+    args = parser.parse_args(argv)
+
+    resumo = executar(args.base, args.saida, args.textos, args.grupos, args.workers, args.top, args.forcar)
+    print(f"{resumo['artefatos']} artefatos, {resumo['renderizados']} renderizados "
+          f"em {resumo['segundos_render']}s -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
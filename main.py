@@ -1,132 +1,132 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.cluster import DBSCAN
-from mlxtend.frequent_patterns import apriori, association_rules
-from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import classification_report, mean_absolute_error
+
+from dados import assinatura_arquivo, carregar_base_st
+from colunas import COL_GENERO, COL_IDADE, COL_MOTIVACAO
+from modelos import COLS_CLUSTER, carregar_ou_treinar
+from agrupamento import GrafoVizinhanca
+import avaliacao
+from associacao import MineradorAssociacoes, colunas_questionario
+from matriz_termos import MatrizTermos
+from servico_nuvem import renderizar_nuvem
+from instrumentacao import iniciar, medir, painel
 
 st.set_page_config(layout="wide")
+iniciar("main")
 st.title("Análise de Dados de Consumo de Moda")
 
-# Leitura do arquivo CSV diretamente
-df = pd.read_csv('moda_lilian.csv')
-
-# Limpeza e padronização dos nomes das colunas
-df.columns = df.columns.str.strip()
+# Leitura da base (cache em Parquet compartilhado com os demais scripts)
+with medir("carga") as m:
+    df = carregar_base_st('moda_lilian.csv')
+    m["linhas"] = len(df)
 
 # Exibir as primeiras linhas da base
 st.subheader("Base de Dados")
 st.write(df.head())
 
-# Nuvem de Palavras
-st.subheader("Nuvem de Palavras - Comentários de Compra")
-
-# Obter o nome exato da coluna
-coluna_motivacao = [col for col in df.columns if 'motiva' in col.lower()][0]
-
-comments = df[coluna_motivacao]
-text = " ".join(str(comment) for comment in comments)
-
-wordcloud = WordCloud(width=800, height=400, background_color='white').generate(text)
-
-plt.figure(figsize=(15, 7))
-plt.imshow(wordcloud, interpolation='bilinear')
-plt.axis('off')
-st.pyplot(plt)
-
-# Pré-processamento para Clustering
-st.subheader("Agrupamento de Consumidores (DBSCAN)")
-
-clustering_data = df[['Qual é a sua faixa etária?', 'Qual é o seu gênero?',
-                      'Você compra roupas de segunda mão (ex: brechós/desapegos)?',
-                      'Você conhece o conceito de moda circular?',
-                      'Você se considera um(a) consumidor(a) consciente? Por quê?']].copy()
-
-# Codificando variáveis categóricas
-for col in clustering_data.columns:
-    clustering_data[col] = LabelEncoder().fit_transform(clustering_data[col].astype(str))
-
-scaler = StandardScaler()
-clustering_data_scaled = scaler.fit_transform(clustering_data)
-
-dbscan = DBSCAN(eps=1.5, min_samples=2)
-clusters = dbscan.fit_predict(clustering_data_scaled)
-
-df['Cluster'] = clusters
-st.write(df[['Qual é a sua faixa etária?', 'Qual é o seu gênero?', 'Cluster']])
-
-st.write("Número de clusters encontrados:", len(set(clusters)) - (1 if -1 in clusters else 0))
+# Nuvem de Palavras (matriz documento-termo montada uma vez por versão da base)
+@st.cache_resource(show_spinner=False)
+def termos_motivacao(assinatura: str):
+    return MatrizTermos(df, [COL_MOTIVACAO])
+
+with medir("nuvem de palavras", linhas=len(df)):
+    st.subheader("Nuvem de Palavras - Comentários de Compra")
+
+    # Frequências das palavras -> PNG em cache (só renderiza de novo se as respostas mudarem)
+    freq = termos_motivacao(assinatura_arquivo('moda_lilian.csv')).frequencias(COL_MOTIVACAO)
+    st.image(renderizar_nuvem(freq), use_container_width=True)
+
+# Modelos treinados fora do caminho interativo (modelos.py); aqui só carregamos os artefatos
+@st.cache_resource(show_spinner="Carregando modelos...")
+def carregar_modelos(caminho: str, assinatura: str):
+    return carregar_ou_treinar(caminho)
+
+with medir("modelos"):
+    modelos = carregar_modelos('moda_lilian.csv', assinatura_arquivo('moda_lilian.csv'))
+
+# Agrupamento de Consumidores
+with medir("agrupamento", linhas=len(df)):
+    st.subheader("Agrupamento de Consumidores (DBSCAN)")
+
+    clusters = modelos["cluster"]["clusters"]
+    df['Cluster'] = clusters
+    st.write(df[[COL_IDADE, COL_GENERO, 'Cluster']])
+
+    st.write("Número de clusters encontrados:", modelos["cluster"]["n_clusters"])
+
+# Sensibilidade do DBSCAN: grafo de vizinhança (Hamming) montado uma vez, varredura barata
+@st.cache_resource(show_spinner=False)
+def grafo_clusters(assinatura: str, eps_max: float):
+    return GrafoVizinhanca(modelos["codificacao"].codigos(df, COLS_CLUSTER), eps_max)
+
+with medir("sensibilidade DBSCAN"):
+    with st.expander("Sensibilidade dos parâmetros (distância de Hamming)"):
+        n_perguntas = len(COLS_CLUSTER)
+        # Com Hamming só existem distâncias múltiplas de 1/n_perguntas
+        eps_valores = [round(i / n_perguntas, 3) for i in range(1, n_perguntas)]
+        grafo = grafo_clusters(assinatura_arquivo('moda_lilian.csv'), max(eps_valores))
+        min_samples_valores = st.multiselect("min_samples", list(range(2, 21)), default=[2, 5, 10])
+        varredura = grafo.varrer(eps_valores, min_samples_valores)
+        varredura["min_samples"] = varredura["min_samples"].astype(str)
+        col_a, col_b = st.columns(2)
+        col_a.write("Número de clusters por eps")
+        col_a.line_chart(varredura, x="eps", y="clusters", color="min_samples")
+        col_b.write("Silhueta (sem ruído) por eps")
+        col_b.line_chart(varredura, x="eps", y="silhueta", color="min_samples")
+        st.dataframe(varredura, use_container_width=True)
 
 # Apriori - Associação de Hábitos
-st.subheader("Associações entre Hábitos de Consumo (Apriori)")
-
-association_data = df[['Você compra roupas de segunda mão (ex: brechós/desapegos)?',
-                       'Você costuma alugar roupas para eventos ou ocasiões especiais?',
-                       'Você conhece o conceito de moda circular?',
-                       'Você estaria disposto(a) a pagar mais por roupas feitas de forma sustentável ou com materiais reciclados?']]
-
-# Transformar respostas em True/False
-association_data = association_data.applymap(lambda x: True if str(x).lower() in ['sim', 'sim.'] else False)
-
-frequent_itemsets = apriori(association_data, min_support=0.2, use_colnames=True)
-rules = association_rules(frequent_itemsets, metric="lift", min_threshold=1)
-
-st.write("Regras de Associação Encontradas:")
-st.write(rules[['antecedents', 'consequents', 'support', 'confidence', 'lift']])
+with medir("associações") as m:
+    st.subheader("Associações entre Hábitos de Consumo (Apriori)")
+
+    rules = modelos["associacao"]["regras"]
+    st.write("Regras de Associação Encontradas:")
+    st.write(rules[['antecedents', 'consequents', 'support', 'confidence', 'lift']])
+    m["linhas"] = len(rules)
+
+# Associações no questionário completo (todas as respostas de múltipla escolha)
+@st.cache_resource(show_spinner=False)
+def minerador_questionario(assinatura: str):
+    return MineradorAssociacoes(df, colunas_questionario(df))
+
+with medir("associações questionário"):
+    with st.expander("Associações no questionário completo"):
+        suporte_min = st.slider("Suporte mínimo", 0.02, 0.5, 0.1, 0.01)
+        lift_min = st.slider("Lift mínimo", 1.0, 3.0, 1.2, 0.1)
+        regras_q = minerador_questionario(assinatura_arquivo('moda_lilian.csv')).regras(suporte_min, lift_min)
+        st.write(f"{len(regras_q)} regras encontradas")
+        st.dataframe(regras_q.sort_values("lift", ascending=False)
+                     [['antecedents', 'consequents', 'support', 'confidence', 'lift']].head(200),
+                     use_container_width=True)
 
 # Previsão de Comportamento - Random Forest
-st.subheader("Previsão de Consumo Consciente")
-
-classification_data = df.dropna()
-
-X = classification_data[['Qual é a sua faixa etária?', 'Qual é o seu gênero?',
-                         'Você compra roupas de segunda mão (ex: brechós/desapegos)?',
-                         'Você conhece o conceito de moda circular?',
-                         'Você gosta de comprar as suas roupas em lojas físicas ou pela internet?']]
-
-y = classification_data['Você se considera um(a) consumidor(a) consciente? Por quê?']
-
-# Codificação
-for col in X.columns:
-    X[col] = LabelEncoder().fit_transform(X[col].astype(str))
-y = LabelEncoder().fit_transform(y.astype(str))
-
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-clf = RandomForestClassifier()
-clf.fit(X_train, y_train)
-y_pred = clf.predict(X_test)
-
-st.write("Relatório de Classificação:")
-st.text(classification_report(y_test, y_pred))
-
-# Previsão de Gasto Mensal
-st.subheader("Previsão de Gasto Mensal com Roupas")
+with medir("previsão"):
+    st.subheader("Previsão de Consumo Consciente")
 
-regression_data = df.dropna()
+    st.write("Relatório de Classificação:")
+    st.text(modelos["classificador"]["relatorio"])
 
-X_reg = regression_data[['Qual é a sua faixa etária?', 'Qual é o seu gênero?',
-                         'Você compra roupas de segunda mão (ex: brechós/desapegos)?',
-                         'Você conhece o conceito de moda circular?',
-                         'Você gosta de comprar as suas roupas em lojas físicas ou pela internet?']]
+    # Previsão de Gasto Mensal
+    st.subheader("Previsão de Gasto Mensal com Roupas")
 
-y_reg = regression_data['Quanto você gasta, em média, com roupas por mês?']
+    st.write("Erro médio absoluto (MAE) da previsão de gasto mensal, em reais (ponto médio da faixa):")
+    st.write(f"R$ {modelos['regressor']['mae']:.2f}")
 
-# Codificação
-for col in X_reg.columns:
-    X_reg[col] = LabelEncoder().fit_transform(X_reg[col].astype(str))
-y_reg = LabelEncoder().fit_transform(y_reg.astype(str))
+# Avaliação cruzada (k-fold + grade de hiperparâmetros), gravada em arquivo
+with medir("avaliação cruzada"):
+    st.subheader("Avaliação Cruzada dos Modelos de Previsão")
 
-X_train_reg, X_test_reg, y_train_reg, y_test_reg = train_test_split(X_reg, y_reg, test_size=0.2, random_state=42)
+    resultados_cv = avaliacao.carregar_resultados('moda_lilian.csv')
+    if resultados_cv is None:
+        st.info("Ainda não há resultados de validação cruzada para esta base "
+                "(também pode ser gerada com `python avaliacao.py`).")
+        if st.button("Rodar avaliação cruzada"):
+            with st.spinner("Rodando validação cruzada..."):
+                resultados_cv = avaliacao.executar('moda_lilian.csv')
 
-reg = RandomForestRegressor()
-reg.fit(X_train_reg, y_train_reg)
-y_pred_reg = reg.predict(X_test_reg)
+    if resultados_cv is not None:
+        for nome_modelo, resultados_modelo in resultados_cv.groupby("modelo"):
+            st.write(f"**{nome_modelo}** – média e desvio-padrão por fold")
+            st.dataframe(avaliacao.resumir(resultados_modelo).dropna(axis=1, how="all"), use_container_width=True)
 
-st.write("Erro médio absoluto (MAE) da previsão de gasto mensal:")
-st.write(mean_absolute_error(y_test_reg, y_pred_reg))
+# Tempos desta execução (barra lateral) e log JSONL opcional
+painel(st)
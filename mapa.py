@@ -0,0 +1,80 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import FastMarkerCluster
+
+# =============================
+# Mapa de frequência por cidade
+# =============================
+# A camada de marcadores é montada a partir dos arrays do agregado (uma lista
+# de linhas enviada de uma vez ao Leaflet) em vez de um CircleMarker por
+# iterrows. O agregado tem uma chave de conteúdo para o cache do mapa: filtros
+# diferentes com as mesmas contagens por cidade reaproveitam o mesmo folium.Map
+# (e os mesmos ids de elemento, então o front-end não redesenha).
+
+CENTRO = [-22.0, -48.0]
+ZOOM = 6
+MAX_MAPAS = 32
+
+_mapas = OrderedDict()
+_trava = threading.Lock()
+
+# Cada linha de dados vira um L.circleMarker no navegador
+_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: row[2], color: row[3], fillColor: row[3], fill: true
+    });
+    marker.bindPopup(row[4]);
+    return marker;
+}
+"""
+
+
+def cores_frequencia(freq: np.ndarray) -> np.ndarray:
+    return np.select([freq >= 50, freq >= 20, freq >= 10], ["red", "orange", "blue"], default="green")
+
+
+def chave_agregado(df_cidades: pd.DataFrame) -> str:
+    valores = pd.util.hash_pandas_object(df_cidades, index=False).to_numpy()
+    return hashlib.sha1(valores.tobytes()).hexdigest()
+
+
+def linhas_marcadores(df_cidades: pd.DataFrame) -> list:
+    freq = df_cidades["Frequência"].to_numpy()
+    raio = 8 + freq / 10
+    cores = cores_frequencia(freq)
+    popups = df_cidades["Cidade_Normalizada"].astype(str) + " - " + df_cidades["Frequência"].astype(str)
+    return list(zip(
+        df_cidades["Lat"].astype(float).tolist(),
+        df_cidades["Lon"].astype(float).tolist(),
+        raio.astype(float).tolist(),
+        cores.tolist(),
+        popups.tolist(),
+    ))
+
+
+def montar_mapa(df_cidades: pd.DataFrame) -> folium.Map:
+    m = folium.Map(location=CENTRO, zoom_start=ZOOM)
+    FastMarkerCluster(linhas_marcadores(df_cidades), callback=_CALLBACK).add_to(m)
+    return m
+
+
+def mapa_cidades(df_cidades: pd.DataFrame) -> folium.Map:
+    """montar_mapa(df_cidades), reaproveitado do cache enquanto o agregado não muda."""
+    chave = chave_agregado(df_cidades)
+    with _trava:
+        if chave in _mapas:
+            _mapas.move_to_end(chave)
+            return _mapas[chave]
+
+    mapa = montar_mapa(df_cidades)
+    with _trava:
+        _mapas[chave] = mapa
+        while len(_mapas) > MAX_MAPAS:
+            _mapas.popitem(last=False)
+    return mapa
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from colunas import COLS_TEXTO
+from texto import tabela_tokens
+
+# =============================
+# Matriz documento-termo esparsa das perguntas abertas
+# =============================
+# Uma matriz CSR (respostas x palavras) por coluna de texto, montada uma vez.
+# Frequências de qualquer subgrupo = soma das linhas selecionadas; por grupo
+# (gênero, faixa etária...) = matriz indicadora do grupo @ matriz de termos.
+
+
+class MatrizTermos:
+    def __init__(self, df: pd.DataFrame, colunas=COLS_TEXTO):
+        self.n_linhas = len(df)
+        self.colunas = list(colunas)
+        self._matrizes = {}
+        self._vocab = {}
+        for col in self.colunas:
+            longa = tabela_tokens(df, col)
+            linhas = df.index.get_indexer(longa.index)
+            codigos, vocab = pd.factorize(longa["Palavra"])
+            self._matrizes[col] = self._montar(linhas, codigos, self.n_linhas, len(vocab))
+            self._vocab[col] = pd.Index(vocab, name="Palavra")
+
+    @staticmethod
+    def _montar(linhas, codigos, n_linhas, n_palavras) -> sparse.csr_matrix:
+        mat = sparse.csr_matrix(
+            (np.ones(len(codigos), dtype=np.int32), (linhas, codigos)),
+            shape=(n_linhas, n_palavras),
+        )
+        mat.sum_duplicates()
+        return mat
+
+    def acrescentar(self, df_novo: pd.DataFrame):
+        """Tokeniza só as linhas novas e as empilha; palavras inéditas entram no fim do vocabulário."""
+        matrizes, vocabs = {}, {}
+        for col in self.colunas:
+            longa = tabela_tokens(df_novo, col)
+            vocab = self._vocab[col]
+            palavras = longa["Palavra"].drop_duplicates()
+            vocab = vocab.append(pd.Index(palavras[~palavras.isin(vocab)], name="Palavra"))
+            novo = self._montar(df_novo.index.get_indexer(longa.index), vocab.get_indexer(longa["Palavra"]),
+                                len(df_novo), len(vocab))
+            antiga = self._matrizes[col].copy()
+            antiga.resize((self.n_linhas, len(vocab)))
+            matrizes[col] = sparse.vstack([antiga, novo], format="csr")
+            vocabs[col] = vocab
+        # Atributos trocados de uma vez (cópias rasas continuam válidas)
+        self._matrizes, self._vocab = matrizes, vocabs
+        self.n_linhas += len(df_novo)
+
+    def matriz(self, coluna) -> sparse.csr_matrix:
+        return self._matrizes[coluna]
+
+    def vocabulario(self, coluna) -> pd.Index:
+        return self._vocab[coluna]
+
+    def frequencias(self, coluna, mascara=None) -> pd.Series:
+        """Frequência de cada palavra nas linhas da máscara (todas, se None)."""
+        mat = self._matrizes[coluna]
+        if mascara is not None:
+            mat = mat[np.flatnonzero(mascara)]
+        soma = np.asarray(mat.sum(axis=0)).ravel()
+        freq = pd.Series(soma, index=self._vocab[coluna], name="Frequência")
+        return freq[freq > 0]
+
+    def top_termos(self, coluna, mascara=None, n=30) -> pd.DataFrame:
+        freq = self.frequencias(coluna, mascara)
+        return freq.nlargest(n, keep="first").reset_index()
+
+    def por_grupo(self, coluna, grupos: pd.Series) -> pd.DataFrame:
+        """Matriz grupos x palavras (DataFrame denso) com uma multiplicação esparsa."""
+        codigos, rotulos = pd.factorize(grupos.to_numpy(), use_na_sentinel=True)
+        validos = codigos >= 0
+        indicadora = sparse.csr_matrix(
+            (np.ones(validos.sum(), dtype=np.int32), (codigos[validos], np.flatnonzero(validos))),
+            shape=(len(rotulos), self.n_linhas),
+        )
+        contagens = (indicadora @ self._matrizes[coluna]).toarray()
+        return pd.DataFrame(contagens, index=pd.Index(rotulos, name=grupos.name), columns=self._vocab[coluna])
@@ -0,0 +1,141 @@
+import argparse
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import DBSCAN
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.metrics import classification_report, mean_absolute_error
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from associacao import MineradorAssociacoes
+from codificacao import EspecificacaoCodificacao
+from dados import DIR_CACHE, assinatura_arquivo, carregar_base
+from faixas import ponto_medio
+from colunas import (
+    COL_2MAO, COL_ALUGUEL, COL_CIRCULAR, COL_GASTO, COL_GENERO, COL_IDADE,
+    COL_LOJA, COL_PAGAR_MAIS, COL_TXT_CONSCIENTE,
+)
+
+# =============================
+# Pipeline de treino dos modelos do main.py
+# =============================
+# Os modelos são treinados uma vez (offline com `python modelos.py` ou no
+# primeiro acesso) e salvos com joblib junto com a codificação. O arquivo é
+# identificado pelo hash da base, então só há novo treino quando os dados mudam.
+
+DIR_MODELOS = DIR_CACHE / "modelos"
+VERSAO_PIPELINE = 4  # incrementar quando mudar o que é treinado
+
+COLS_CLUSTER = [COL_IDADE, COL_GENERO, COL_2MAO, COL_CIRCULAR, COL_TXT_CONSCIENTE]
+COLS_ASSOCIACAO = [COL_2MAO, COL_ALUGUEL, COL_CIRCULAR, COL_PAGAR_MAIS]
+COLS_PREVISAO = [COL_IDADE, COL_GENERO, COL_2MAO, COL_CIRCULAR, COL_LOJA]
+ALVO_CONSCIENTE = COL_TXT_CONSCIENTE
+ALVO_GASTO = COL_GASTO
+
+
+def ajustar_codificacao(df: pd.DataFrame) -> EspecificacaoCodificacao:
+    colunas = list(dict.fromkeys(COLS_CLUSTER + COLS_PREVISAO + [ALVO_CONSCIENTE, ALVO_GASTO]))
+    return EspecificacaoCodificacao(colunas).ajustar(df)
+
+
+def treinar_clusters(df: pd.DataFrame, cod: EspecificacaoCodificacao) -> dict:
+    X = cod.codigos(df, COLS_CLUSTER)
+    scaler = StandardScaler()
+    dbscan = DBSCAN(eps=1.5, min_samples=2)
+    clusters = dbscan.fit_predict(scaler.fit_transform(X))
+    return {
+        "scaler": scaler,
+        "dbscan": dbscan,
+        "clusters": clusters,
+        "n_clusters": len(set(clusters)) - (1 if -1 in clusters else 0),
+    }
+
+
+def treinar_associacoes(df: pd.DataFrame) -> dict:
+    # Respostas "sim" viram itens (bitsets); suporte por contagem de bits
+    minerador = MineradorAssociacoes(df, COLS_ASSOCIACAO, somente_sim=True)
+    itemsets = minerador.itemsets(min_support=0.2)
+    regras = minerador.regras(min_support=0.2, min_lift=1)
+    return {"itemsets": itemsets, "regras": regras}
+
+
+def treinar_classificador(df: pd.DataFrame, cod: EspecificacaoCodificacao) -> dict:
+    dados = df.dropna()
+    X = cod.codigos(dados, COLS_PREVISAO)
+    y = cod.codigos(dados, [ALVO_CONSCIENTE])[:, 0]
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    clf = RandomForestClassifier()
+    clf.fit(X_train, y_train)
+    return {
+        "modelo": clf,
+        "relatorio": classification_report(y_test, clf.predict(X_test), zero_division=0),
+    }
+
+
+def alvo_gasto(df: pd.DataFrame) -> np.ndarray:
+    """Ponto médio (R$) da faixa de gasto mensal; NaN se a resposta não for uma faixa."""
+    return ponto_medio(df[ALVO_GASTO])
+
+
+def treinar_regressor(df: pd.DataFrame, cod: EspecificacaoCodificacao) -> dict:
+    dados = df.dropna()
+    y = alvo_gasto(dados)
+    ok = ~np.isnan(y)
+    X, y = cod.codigos(dados, COLS_PREVISAO)[ok], y[ok]
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    reg = RandomForestRegressor()
+    reg.fit(X_train, y_train)
+    return {
+        "modelo": reg,
+        "mae": mean_absolute_error(y_test, reg.predict(X_test)),
+    }
+
+
+def treinar_modelos(df: pd.DataFrame) -> dict:
+    # Uma única codificação, ajustada uma vez e usada pelos três modelos
+    cod = ajustar_codificacao(df)
+    return {
+        "codificacao": cod,
+        "cluster": treinar_clusters(df, cod),
+        "associacao": treinar_associacoes(df),
+        "classificador": treinar_classificador(df, cod),
+        "regressor": treinar_regressor(df, cod),
+    }
+
+
+def caminho_artefatos(caminho_base) -> Path:
+    caminho_base = Path(caminho_base)
+    digest = assinatura_arquivo(caminho_base)
+    return DIR_MODELOS / f"{caminho_base.stem}-v{VERSAO_PIPELINE}-{digest[:16]}.joblib"
+
+
+def carregar_ou_treinar(caminho_base="moda_lilian.csv", forcar=False) -> dict:
+    arquivo = caminho_artefatos(caminho_base)
+    if arquivo.exists() and not forcar:
+        return joblib.load(arquivo)
+
+    artefatos = treinar_modelos(carregar_base(caminho_base))
+    DIR_MODELOS.mkdir(parents=True, exist_ok=True)
+    for antigo in DIR_MODELOS.glob(f"{Path(caminho_base).stem}-*.joblib"):
+        antigo.unlink()
+    joblib.dump(artefatos, arquivo)
+    return artefatos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Treina e salva os modelos usados no main.py.")
+    parser.add_argument("--base", default="moda_lilian.csv")
+    parser.add_argument("--forcar", action="store_true", help="treina mesmo se já houver artefatos")
+    args = parser.parse_args(argv)
+
+    carregar_ou_treinar(args.base, forcar=args.forcar)
+    print(f"Artefatos em {caminho_artefatos(args.base)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,37 @@
-import pandas as pd
-import nltk
-from nltk.corpus import stopwords
 from wordcloud import WordCloud
 import matplotlib.pyplot as plt
-from collections import Counter
-import re
 
-# Baixar stopwords
-nltk.download('stopwords')
-stop_words = set(stopwords.words('portuguese'))
+from dados import carregar_base
+from colunas import COL_GENERO, COLS_TEXTO
+from matriz_termos import MatrizTermos
 
-# Leitura da base de dados
-df = pd.read_csv('moda_lilian.csv')
-
-# Tratamento das colunas: remover quebras de linha e espaços extras
-df.columns = df.columns.str.replace('\n', ' ').str.strip()
+# Leitura só das perguntas abertas e do gênero (cabeçalhos resolvidos pelo esquema)
+df = carregar_base('moda_lilian.csv', [COL_GENERO, *COLS_TEXTO])
 
 # Conferir o nome das colunas tratadas
 print("Colunas disponíveis:", df.columns)
 
 # Lista das colunas de interesse
-colunas = [
-    'O que te motiva a comprar roupas novas? (Ex: necessidade, estilo, promoção, rede social, entre outros)',
-    'Você se considera um(a) consumidor(a) consciente? Por quê?',
-    'Qual ou quais são as marcas de roupas que você mais gosta de comprar?'
-]
+colunas = list(COLS_TEXTO)
 
 # Nome da coluna de gênero (ajuste se estiver diferente na sua base)
-coluna_genero = 'Qual é o seu gênero?'
-
-# Função para limpar o texto
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-ZÀ-ÿ\s]', '', text)  # Remover pontuações
-    words = [word for word in text.split() if word not in stop_words]
-    return words
+coluna_genero = COL_GENERO
 
-# Palavras que você quer remover de cada coluna
-remover_palavras = {
-    'O que te motiva a comprar roupas novas? (Ex: necessidade, estilo, promoção, rede social, entre outros)':
-        ['roupas', 'comprar', 'ex', 'promoção'],
-    'Você se considera um(a) consumidor(a) consciente? Por quê?': ['consumidor', 'consumidora', 'porque'],
-    'Qual ou quais são as marcas de roupas que você mais gosta de comprar?': ['roupas', 'comprar', 'marcas', 'gosto', 'marca', 'compro', 'preferência', 'ligo', 'qualidade', 'bem', 'específica', 'roupa', 'sei', 'uso', 'sim']
-}
+# Matriz documento-termo esparsa das três perguntas, montada uma vez
+termos = MatrizTermos(df, colunas)
 
 # Analisar para cada coluna e para cada gênero
 for col in colunas:
     print(f"\nProcessando a coluna: {col}")
 
-    # Filtrar os gêneros únicos na base
-    generos_unicos = df[coluna_genero].dropna().unique()
+    # Frequências de todos os gêneros de uma vez (gêneros x palavras)
+    freq_generos = termos.por_grupo(col, df[coluna_genero])
 
-    for genero in generos_unicos:
+    for genero, linha in freq_generos.iterrows():
         print(f"\nAnalisando o gênero: {genero}")
 
-        # Filtrar os dados apenas para o gênero atual
-        df_genero = df[df[coluna_genero] == genero]
-
-        # Concatenar os textos da coluna
-        text_data = ' '.join(df_genero[col].dropna().astype(str))
-
-        # Limpar e tokenizar o texto
-        words = clean_text(text_data)
-
-        # Remover palavras personalizadas
-        palavras_excluir = remover_palavras.get(col, [])
-        words = [word for word in words if word not in palavras_excluir]
-
-        # Contar frequência das palavras
-        word_freq = Counter(words)
+        linha = linha[linha > 0]
+        word_freq = linha.to_dict()
 
         if len(word_freq) == 0:
             print("Sem palavras relevantes para este gênero.")
@@ -87,5 +50,5 @@ for col in colunas:
 
         # Exibir as 15 palavras mais citadas
         print(f"\nPalavras mais citadas - {col} - Gênero: {genero}\n")
-        freq_df = pd.DataFrame(word_freq.most_common(15), columns=['Palavra', 'Frequência'])
+        freq_df = linha.nlargest(15).rename("Frequência").reset_index()
         print(freq_df)
@@ -0,0 +1,157 @@
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from dados import COL_DATA, DIR_CACHE, assinatura_arquivo, carregar_base, gravar_json, trava_arquivo
+from colunas import COL_GENERO, COL_IDADE, COL_RENDA
+from cubo import SEM_RESPOSTA
+
+# =============================
+# Armazém de várias ondas da pesquisa (Parquet particionado)
+# =============================
+# Uso:  python ondas.py moda_lilian.csv [--onda 2025-S1] [--substituir]
+# Cada exportação é uma onda, gravada em .cache/ondas/onda=<onda>/data=<dia>/;
+# um rótulo já gravado a partir de outro arquivo só é regravado com --substituir.
+# Dentro de cada partição as linhas ficam ordenadas por gênero/idade/renda,
+# então as estatísticas dos grupos de linhas do Parquet deixam o pyarrow pular
+# o que não passa no filtro. Consultas leem só as ondas e colunas pedidas.
+
+DIR_ONDAS = DIR_CACHE / "ondas"
+REGISTRO = "_registro.json"  # prefixo "_" fica fora do dataset
+COLS_ORDENACAO = (COL_GENERO, COL_IDADE, COL_RENDA)
+LINHAS_POR_GRUPO = 4096
+PARTICIONAMENTO = ds.partitioning(pa.schema([("onda", pa.string()), ("data", pa.string())]), flavor="hive")
+
+
+def rotulo_onda(carimbos: pd.Series) -> str:
+    """Semestre da primeira resposta, ex. 2025-S1."""
+    inicio = carimbos.min()
+    if pd.isna(inicio):
+        raise ValueError("Sem carimbo de data/hora para deduzir a onda; informe --onda")
+    return f"{inicio.year}-S{1 if inicio.month <= 6 else 2}"
+
+
+def filtro_selecoes(selecoes: dict):
+    """Expressão pyarrow: resposta dentro dos valores escolhidos em cada coluna."""
+    expr = None
+    for col, valores in selecoes.items():
+        termo = ds.field(col).isin(pa.array([str(v) for v in valores], type=pa.string()))
+        expr = termo if expr is None else expr & termo
+    return expr
+
+
+class ArmazemOndas:
+    def __init__(self, diretorio=DIR_ONDAS):
+        self.dir = Path(diretorio)
+        self.arq_registro = self.dir / REGISTRO
+
+    def registro(self) -> dict:
+        if not self.arq_registro.exists():
+            return {}
+        return json.loads(self.arq_registro.read_text(encoding="utf-8"))
+
+    def ondas(self) -> list:
+        return sorted(p.name.split("=", 1)[1] for p in self.dir.glob("onda=*"))
+
+    def adicionar(self, df: pd.DataFrame, onda=None) -> str:
+        """Grava (ou regrava) uma onda inteira; devolve o rótulo usado."""
+        onda = onda or rotulo_onda(df[COL_DATA])
+        destino = self.dir / f"onda={onda}"
+        if destino.exists():
+            shutil.rmtree(destino)
+
+        df = df.sort_values(list(COLS_ORDENACAO), kind="stable", na_position="last")
+        df = df.assign(onda=onda, data=df[COL_DATA].dt.strftime("%Y-%m-%d").fillna("sem-data"))
+        ds.write_dataset(
+            pa.Table.from_pandas(df, preserve_index=False), self.dir,
+            format="parquet", partitioning=PARTICIONAMENTO,
+            existing_data_behavior="overwrite_or_ignore",
+            basename_template=f"{onda}-{{i}}.parquet",
+            max_rows_per_group=LINHAS_POR_GRUPO, min_rows_per_group=min(LINHAS_POR_GRUPO, len(df)) or 1,
+        )
+        return onda
+
+    def registrar(self, caminho, onda=None, substituir=False, incremental=None) -> str:
+        """Adiciona a exportação como onda, a menos que este mesmo arquivo já esteja gravado.
+
+        Cada onda pertence a um arquivo: gravar outro arquivo com o rótulo de
+        uma onda existente exige `substituir`. Com `incremental` (a
+        ingestao.BaseIncremental desta exportação) as respostas acrescentadas
+        depois da exportação entram na mesma onda.
+        """
+        caminho = Path(caminho)
+        assinatura = assinatura_arquivo(caminho) if incremental is None else incremental.versao
+        # Outro processo (dashboard, relatório, CLI) pode estar gravando ao mesmo tempo
+        with trava_arquivo(self.arq_registro):
+            registro = self.registro()
+            anterior = registro.get(caminho.name)
+            if anterior and anterior["hash"] == assinatura and (onda is None or onda == anterior["onda"]):
+                return anterior["onda"]
+
+            df = carregar_base(caminho) if incremental is None else incremental.armazem.ler()
+            onda = onda or rotulo_onda(df[COL_DATA])
+            donos = [nome for nome, r in registro.items() if r["onda"] == onda and nome != caminho.name]
+            if donos and not substituir:
+                raise ValueError(f"A onda {onda} já foi gravada a partir de {', '.join(donos)}; "
+                                 "use outro rótulo (--onda) ou --substituir")
+            for nome in donos:
+                del registro[nome]
+
+            self.adicionar(df, onda)
+            # O arquivo mudou de rótulo: a partição antiga tem as mesmas respostas
+            if anterior and anterior["onda"] != onda:
+                shutil.rmtree(self.dir / f"onda={anterior['onda']}", ignore_errors=True)
+            registro[caminho.name] = {"hash": assinatura, "onda": onda}
+            gravar_json(self.arq_registro, registro, indent=2, ensure_ascii=False)
+        return onda
+
+    def ler(self, colunas=None, selecoes=None, ondas=None) -> pd.DataFrame:
+        """Só as colunas pedidas (+ onda), das ondas pedidas, com os filtros empurrados ao Parquet."""
+        # Sem onda gravada ou com algum filtro esvaziado nenhuma linha passa
+        if not self.ondas() or any(len(v) == 0 for v in (selecoes or {}).values()):
+            return pd.DataFrame(columns=["onda", *(colunas or [])])
+        dataset = ds.dataset(self.dir, format="parquet", partitioning=PARTICIONAMENTO)
+        expr = filtro_selecoes(selecoes or {})
+        if ondas is not None:
+            termo = ds.field("onda").isin(list(ondas))
+            expr = termo if expr is None else expr & termo
+        if colunas is not None:
+            colunas = ["onda", *[c for c in colunas if c != "onda"]]
+        return dataset.to_table(columns=colunas, filter=expr).to_pandas()
+
+    def tendencia(self, coluna: str, selecoes=None, ondas=None) -> pd.DataFrame:
+        """Contagem e % de cada resposta por onda (mesma limpeza de cubo.normalizar_respostas)."""
+        df = self.ler([coluna], selecoes, ondas)
+        respostas = df[coluna].astype("string").fillna(SEM_RESPOSTA).str.strip()
+        counts = respostas.groupby(df["onda"].astype(str)).value_counts().rename("Contagem")
+        out = counts.reset_index().rename(columns={"onda": "Onda", coluna: "Categoria"})
+        out["%"] = (out["Contagem"] / out.groupby("Onda")["Contagem"].transform("sum") * 100).round(1)
+        return out.sort_values(["Onda", "Contagem"], ascending=[True, False], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grava exportações da pesquisa como ondas particionadas.")
+    parser.add_argument("arquivos", nargs="*")
+    parser.add_argument("--onda", help="rótulo da onda (padrão: semestre da primeira resposta)")
+    parser.add_argument("--substituir", action="store_true",
+                        help="regrava a onda mesmo que ela tenha vindo de outro arquivo")
+    args = parser.parse_args(argv)
+    if args.onda and len(args.arquivos) > 1:
+        parser.error("--onda só pode ser usado com um arquivo")
+
+    armazem = ArmazemOndas()
+    for arq in args.arquivos:
+        try:
+            print(f"{arq} -> onda {armazem.registrar(arq, args.onda, args.substituir)}")
+        except ValueError as erro:
+            parser.error(str(erro))
+    print("Ondas gravadas:", ", ".join(armazem.ondas()) or "nenhuma")
+
+
+if __name__ == "__main__":
+    main()
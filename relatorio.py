@@ -0,0 +1,240 @@
+import argparse
+import base64
+import html
+import importlib.util
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import altair as alt
+import folium
+import pandas as pd
+
+from colunas import COL_CIDADE, COL_ESCOLAR, COL_GENERO, COL_IDADE, COL_RENDA, COLS_FILTRO, COLS_TEXTO
+from esquema import POR_PERGUNTA
+from ingestao import BaseIncremental
+from lote_nuvens import slug
+from ondas import ArmazemOndas
+from secoes import MEDIDAS, SECOES, preparar_base
+
+# =============================
+# Relatório estático do dashboard por conjunto de filtros
+# =============================
+# Uso:  python relatorio.py --saida relatorio --presets presets.json --segmentar genero idade --workers 4
+# Cada preset é um conjunto de filtros da barra lateral ({"genero": [...], ...};
+# filtro omitido = todas as respostas). Para cada preset as seções do
+# dashboard (secoes.py) são calculadas sobre o mesmo cubo e gravadas como
+# XLSX (uma aba por tabela), CSV, PNG e uma página HTML com os gráficos
+# Vega-Lite. A base, o índice e o cubo são montados uma vez e enviados uma
+# vez a cada processo do pool; os presets são distribuídos entre eles.
+
+FILTROS = {
+    "genero": COL_GENERO,
+    "idade": COL_IDADE,
+    "escolaridade": COL_ESCOLAR,
+    "renda": COL_RENDA,
+    "cidade": COL_CIDADE,
+}
+FORMATOS = ("xlsx", "csv", "png", "html")
+MANIFESTO = "manifesto.json"
+
+# Seções com controle próprio no dashboard rodam uma vez por valor do controle
+VARIANTES = {
+    "motivacao": [{"col_texto": col} for col in COLS_TEXTO],
+}
+
+_HTML = """<!doctype html>
+<html lang="pt-br"><head><meta charset="utf-8"><title>{titulo}</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@{vega}"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@{vegalite}"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@{vegaembed}"></script>
+<style>body {{font-family: sans-serif; margin: 2em;}} table {{border-collapse: collapse; margin: 1em 0;}}
+td, th {{border: 1px solid #ddd; padding: 4px 8px;}}</style>
+</head><body>
+{corpo}
+</body></html>
+"""
+
+_estado = {}
+
+
+def ler_presets(caminho=None) -> dict:
+    """{nome: filtros}: a base toda mais os presets do JSON."""
+    presets = {"todos": {}}
+    if caminho:
+        presets.update(json.loads(Path(caminho).read_text(encoding="utf-8")))
+    for nome, filtros in presets.items():
+        desconhecidos = set(filtros) - set(FILTROS)
+        if desconhecidos:
+            raise ValueError(f"Preset {nome!r}: filtros desconhecidos {sorted(desconhecidos)}; use {list(FILTROS)}")
+    return presets
+
+
+def segmentos(indice, segmentar) -> dict:
+    """Um preset por combinação das categorias dos filtros em `segmentar`."""
+    if not segmentar:
+        return {}
+    presets = {}
+    for combinacao in itertools.product(*(indice.categorias(FILTROS[f]) for f in segmentar)):
+        nome = ",".join(f"{f}={v}" for f, v in zip(segmentar, combinacao))
+        presets[nome] = {f: [v] for f, v in zip(segmentar, combinacao)}
+    return presets
+
+
+def _iniciar(estado: dict):
+    _estado.update(estado)
+
+
+def _selecoes(filtros: dict) -> dict:
+    indice = _estado["indice"]
+    selecoes = {c: indice.categorias(c) for c in COLS_FILTRO}
+    for f, valores in filtros.items():
+        selecoes[FILTROS[f]] = list(valores)
+    return selecoes
+
+
+def _execucoes():
+    """(seção, prefixo dos arquivos, entradas extras) de cada seção e variante."""
+    for secao in SECOES:
+        for extras in VARIANTES.get(secao.chave, [{}]):
+            prefixo = secao.chave
+            if "col_texto" in extras:
+                prefixo += "-" + POR_PERGUNTA[extras["col_texto"]].chave
+            yield secao, prefixo, extras
+
+
+def _tabela_html(df: pd.DataFrame) -> str:
+    return df.to_html(index=False, border=0, float_format=lambda v: f"{v:.2f}")
+
+
+def gerar_preset(nome: str, filtros: dict, saida: str, formatos) -> dict:
+    selecoes = _selecoes(filtros)
+    mascara = _estado["indice"].mascara(selecoes)
+    resumo = {"preset": nome, "filtros": filtros, "linhas": int(mascara.sum()), "arquivos": 0}
+    if not mascara.any():
+        return resumo
+
+    pasta = Path(saida) / slug(nome)
+    pasta.mkdir(parents=True, exist_ok=True)
+    entradas = {**_estado, "selecoes": selecoes, "mascara": mascara}
+    tabelas, corpo, n = {}, [f"<h1>{html.escape(nome)}</h1><p>{resumo['linhas']} respostas</p>"], 0
+
+    for secao, prefixo, extras in _execucoes():
+        r = secao.calcular({**entradas, **extras})
+        corpo.append(f"<h2>{html.escape(secao.titulo)}</h2>")
+        if "col_texto" in extras:
+            corpo.append(f"<h3>{html.escape(extras['col_texto'])}</h3>")
+
+        for chave, valor in r.items():
+            arquivo = f"{prefixo}__{chave}"
+            if isinstance(valor, pd.DataFrame):
+                tabelas[f"{prefixo} {chave}"[:31]] = valor
+                if "csv" in formatos:
+                    valor.to_csv(pasta / f"{arquivo}.csv", index=False)
+                    n += 1
+                corpo.append(_tabela_html(valor))
+            elif isinstance(valor, bytes):  # nuvem de palavras
+                if "png" in formatos:
+                    (pasta / f"{arquivo}.png").write_bytes(valor)
+                    n += 1
+                corpo.append(f'<img src="data:image/png;base64,{base64.b64encode(valor).decode()}">')
+            elif isinstance(valor, folium.Map):
+                if "html" in formatos:
+                    valor.save(str(pasta / f"{arquivo}.html"))
+                    n += 1
+                    corpo.append(f'<iframe src="{arquivo}.html" width="800" height="600"></iframe>')
+
+        for chave, (montar, tb, params) in secao.graficos(r).items():
+            grafico = montar(tb, **params)
+            if "png" in formatos:
+                grafico.save(str(pasta / f"{prefixo}__grafico_{chave}.png"))
+                n += 1
+            id_div = f"g-{prefixo}-{chave}"
+            spec = grafico.to_json(indent=None).replace("</", "<\\/")  # texto livre dentro de <script>
+            corpo.append(f'<div id="{id_div}"></div><script>vegaEmbed("#{id_div}", {spec});</script>')
+
+    if "xlsx" in formatos:
+        with pd.ExcelWriter(pasta / "relatorio.xlsx", engine="openpyxl") as xlsx:
+            for aba, df in tabelas.items():
+                df.to_excel(xlsx, sheet_name=aba, index=False)
+        n += 1
+    if "html" in formatos:
+        (pasta / "index.html").write_text(_pagina(nome, "\n".join(corpo)), encoding="utf-8")
+        n += 1
+    resumo["arquivos"] = n
+    return resumo
+
+
+def _pagina(titulo: str, corpo: str) -> str:
+    return _HTML.format(titulo=html.escape(titulo), corpo=corpo, vega=alt.VEGA_VERSION,
+                        vegalite=alt.VEGALITE_VERSION, vegaembed=alt.VEGAEMBED_VERSION)
+
+
+def executar(base, saida, presets, segmentar=(), formatos=FORMATOS, workers=None) -> dict:
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+
+    # Base, índice e cubo uma vez; cada processo recebe uma cópia no início
+    incremental = BaseIncremental(base, COLS_FILTRO, MEDIDAS, preparar=preparar_base)
+    incremental.atualizar()
+    df_raw, indice, cubo, termos, cidades_total = incremental.estruturas()
+    ondas = ArmazemOndas()
+    ondas.registrar(base, incremental=incremental)
+    estado = {
+        "versao": incremental.versao,
+        "df_raw": df_raw,
+        "indice": indice,
+        "cubo": cubo,
+        "termos": termos,
+        "cidades_total": cidades_total,
+        "ondas": ondas,
+    }
+    presets = {**presets, **segmentos(indice, segmentar)}
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar, initargs=(estado,)) as pool:
+        futuros = [pool.submit(gerar_preset, nome, filtros, str(saida), tuple(formatos))
+                   for nome, filtros in presets.items()]
+        resumos = [f.result() for f in futuros]
+
+    if "html" in formatos:
+        itens = "\n".join(
+            f'<li><a href="{slug(r["preset"])}/index.html">{html.escape(r["preset"])}</a> ({r["linhas"]} respostas)</li>'
+            for r in resumos if r["arquivos"]
+        )
+        (saida / "index.html").write_text(_pagina("Relatório", f"<h1>Relatório</h1><ul>{itens}</ul>"),
+                                          encoding="utf-8")
+    (saida / MANIFESTO).write_text(json.dumps({"versao": incremental.versao, "presets": resumos},
+                                              indent=2, ensure_ascii=False), encoding="utf-8")
+    return {
+        "presets": len(resumos),
+        "vazios": sum(1 for r in resumos if not r["linhas"]),
+        "arquivos": sum(r["arquivos"] for r in resumos),
+        "segundos": round(time.perf_counter() - inicio, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera as tabelas e gráficos do dashboard para presets de filtros.")
+    parser.add_argument("--base", default="moda.xlsx")
+    parser.add_argument("--saida", default="relatorio")
+    parser.add_argument("--presets", help='JSON {"nome": {"genero": [...], "idade": [...]}}')
+    parser.add_argument("--segmentar", nargs="*", choices=list(FILTROS), default=[],
+                        help="um preset por combinação de categorias destes filtros")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["xlsx", "csv", "html"])
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    # PNG dos gráficos Vega-Lite é exportado pelo Altair via vl-convert
+    if "png" in args.formatos and importlib.util.find_spec("vl_convert") is None:
+        parser.error("o formato png precisa do pacote vl-convert-python")
+
+    resumo = executar(args.base, args.saida, ler_presets(args.presets), args.segmentar, args.formatos, args.workers)
+    print(f"{resumo['presets']} presets ({resumo['vazios']} sem respostas), {resumo['arquivos']} arquivos "
+          f"em {resumo['segundos']}s -> {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from streamlit_folium import st_folium
+
+from circularidade import CIRC_LABELS, COL_CIRC, COLS_CIRCULARIDADE, build_indice_circularidade
+from cidades import frequencia_cidades, resolver
+from colunas import (
+    COL_2MAO, COL_CIDADE, COL_ESCOLAR, COL_FREQ, COL_GASTO, COL_GENERO, COL_IDADE, COL_IMPACTO, COL_ODS,
+    COL_RENDA, COLS_FILTRO, COLS_TEXTO,
+)
+from esquema import tipar
+from faixas import media_por_grupo, ordenar_faixas
+from graficos import barras, barras_agrupadas, calor, chave_tabela, colunas, linhas, mostrar, painel_barras, pizza
+from mapa import mapa_cidades
+from servico_nuvem import renderizar_nuvem
+
+# =============================
+# Seções do dashboard
+# =============================
+# Cada seção declara as entradas de que depende, separa o cálculo (tabelas,
+# sem Streamlit) do desenho e só roda quando a sua aba está aberta. O
+# resultado do cálculo fica num cache único do processo, por seção, indexado
+# pela versão da base e pelo valor das dependências: voltar a uma aba, mexer
+# no controle de outra seção ou abrir a mesma combinação de filtros em outra
+# sessão não refaz as contas. Os resultados são compartilhados entre sessões
+# e tratados como somente leitura. Os gráficos de cada seção são declarados
+# à parte (tipo, tabela, parâmetros) para o relatório estático reaproveitá-los.
+
+MEDIDAS = (COL_GENERO, COL_IDADE, COL_ESCOLAR, COL_RENDA, COL_FREQ, COL_GASTO, COL_2MAO, COL_ODS,
+           (COL_IMPACTO, COL_CIRC), (COL_RENDA, COL_GASTO))
+
+PERFIL = [COL_GENERO, COL_IDADE, COL_ESCOLAR, COL_RENDA]
+FILTROS_ONDAS = (COL_GENERO, COL_IDADE, COL_RENDA)
+
+MAX_RESULTADOS = 64  # por seção, somando todas as sessões
+
+
+def preparar_base(base: pd.DataFrame) -> pd.DataFrame:
+    # Tipos do esquema: faixas etária e de renda já vêm em ordem nos filtros
+    base = tipar(base, COLS_FILTRO + COLS_CIRCULARIDADE)
+    idx = build_indice_circularidade(base)
+    base[COL_CIRC] = idx.map(CIRC_LABELS).fillna("(Indefinido)")
+    return base
+
+
+@dataclass(frozen=True)
+class Secao:
+    chave: str
+    titulo: str
+    dependencias: tuple
+    calcular: Callable      # entradas -> dict de tabelas
+    desenhar: Callable      # (st, tabelas, entradas)
+    graficos: Callable      # tabelas -> {nome: (montar, tabela, parâmetros)}
+    controles: Callable = None  # (st) -> entradas extras vindas de widgets da seção
+
+
+def impressao(valor) -> str:
+    """Identidade de uma dependência para o cache de resultados."""
+    if isinstance(valor, dict):
+        # A ordem em que as opções foram marcadas no multiselect não muda o filtro
+        valor = {k: sorted(map(str, v)) if isinstance(v, (list, tuple)) else v for k, v in valor.items()}
+    if isinstance(valor, pd.DataFrame):
+        return chave_tabela(valor)
+    if isinstance(valor, np.ndarray):
+        return hashlib.sha1(valor.tobytes()).hexdigest()
+    if isinstance(valor, (dict, list, tuple, str, int, float, bool)) or valor is None:
+        return json.dumps(valor, sort_keys=True, default=str)
+    # Estruturas da base (cubo, termos...) são cobertas pela versão
+    return type(valor).__name__
+
+
+class CacheResultados:
+    """Resultados das seções compartilhados entre threads (sessões do Streamlit)."""
+
+    def __init__(self, max_por_secao=MAX_RESULTADOS):
+        self.max_por_secao = max_por_secao
+        self._guardados = {}
+        self._calculando = {}
+        self._trava = threading.Lock()
+
+    def _buscar(self, secao: str, chave):
+        guardados = self._guardados.setdefault(secao, OrderedDict())
+        if chave in guardados:
+            guardados.move_to_end(chave)
+            return guardados[chave]
+        return None
+
+    def obter(self, secao: Secao, entradas: dict) -> dict:
+        chave = (entradas["versao"],) + tuple(impressao(entradas[d]) for d in secao.dependencias)
+        with self._trava:
+            tabelas = self._buscar(secao.chave, chave)
+            if tabelas is not None:
+                return tabelas
+            trava = self._calculando.setdefault((secao.chave, chave), threading.Lock())
+
+        # Sessões que pedem a mesma combinação ao mesmo tempo esperam um único cálculo
+        with trava:
+            with self._trava:
+                tabelas = self._buscar(secao.chave, chave)
+                if tabelas is not None:
+                    return tabelas
+            try:
+                tabelas = secao.calcular(entradas)
+                with self._trava:
+                    guardados = self._guardados[secao.chave]
+                    guardados[chave] = tabelas
+                    while len(guardados) > self.max_por_secao:
+                        guardados.popitem(last=False)
+            finally:
+                with self._trava:
+                    self._calculando.pop((secao.chave, chave), None)
+        return tabelas
+
+
+def renderizar(st, secao: Secao, entradas: dict, cache: CacheResultados):
+    if secao.controles is not None:
+        entradas = {**entradas, **secao.controles(st)}
+    secao.desenhar(st, cache.obter(secao, entradas), entradas)
+
+
+def _grafico(st, graficos: dict, nome: str):
+    montar, tb, params = graficos[nome]
+    mostrar(st, montar, tb, **params)
+
+
+def _filtrado(e: dict) -> pd.DataFrame:
+    return e["df_raw"][e["mascara"]]
+
+
+# =============================
+# A) Perfil dos participantes
+# =============================
+def calcular_perfil(e: dict) -> dict:
+    # Uma tabela longa para as quatro perguntas; cada painel filtra a sua no navegador
+    tb = pd.concat([e["cubo"].vc_table(col, e["selecoes"]).assign(Pergunta=col) for col in PERFIL],
+                   ignore_index=True)
+    tb["Categoria"] = tb["Categoria"].astype(str)
+    return {"perfil": tb}
+
+
+def graficos_perfil(r: dict) -> dict:
+    return {"perfil": (painel_barras, r["perfil"], {"paineis": PERFIL})}
+
+
+def desenhar_perfil(st, r: dict, e: dict):
+    st.header("A) Perfil dos participantes")
+    if e["mostrar_tabelas"]:
+        for col, tb in r["perfil"].groupby("Pergunta", sort=False):
+            st.subheader(col)
+            st.dataframe(tb.drop(columns="Pergunta"), use_container_width=True, hide_index=True)
+    _grafico(st, graficos_perfil(r), "perfil")
+
+
+# =============================
+# Mapa de frequência por cidade
+# =============================
+def calcular_mapa(e: dict) -> dict:
+    # Sem filtro ativo usa a contagem mantida pela ingestão
+    mascara = e["mascara"]
+    df_cidades = e["cidades_total"] if mascara.all() else frequencia_cidades(_filtrado(e)[COL_CIDADE])
+    return {"cidades": df_cidades, "mapa": mapa_cidades(df_cidades)}
+
+
+def graficos_mapa(r: dict) -> dict:
+    return {}  # o mapa é folium, fora do Vega-Lite
+
+
+def desenhar_mapa(st, r: dict, e: dict):
+    df_cidades = r["cidades"]
+    st.subheader("Mapa de Frequência por Cidade")
+    # Sem objetos de retorno, mover/zoom no mapa não dispara novo rerun
+    st_folium(r["mapa"], width=800, height=600, key="mapa_cidades", returned_objects=[])
+
+    st.subheader("📊 Estatísticas")
+    st.write(f"**Total de cidades:** {df_cidades['Cidade_Normalizada'].nunique()}")
+    st.write(f"**Frequência Total:** {df_cidades['Frequência'].sum()}")
+    st.dataframe(df_cidades.sort_values("Frequência", ascending=False))
+
+
+# =============================
+# B) Frequência de compra e faixa de gasto
+# =============================
+def calcular_frequencia_gasto(e: dict) -> dict:
+    cubo, selecoes = e["cubo"], e["selecoes"]
+    df = _filtrado(e)
+    tb_freq = cubo.vc_table(COL_FREQ, selecoes)
+    tb_gasto = cubo.vc_table(COL_GASTO, selecoes)
+
+    # Faixas de gasto/renda como valores em R$ (ponto médio da faixa)
+    cross_gasto = cubo.crosstab(COL_RENDA, COL_GASTO, selecoes)
+    heat = cross_gasto.reset_index().melt(id_vars=COL_RENDA, var_name="Gasto", value_name="Contagem")
+    heat = heat.rename(columns={COL_RENDA: "Renda"})
+
+    cidade_norm = df[COL_CIDADE].map(resolver(df[COL_CIDADE].dropna().unique())["Cidade"])
+    gasto_cidade = media_por_grupo(df, COL_GASTO, cidade_norm.rename("Cidade"))
+    return {
+        "freq": tb_freq,
+        "gasto": tb_gasto,
+        "calor": heat,
+        "ordem_renda": ordenar_faixas(pd.Series(cross_gasto.index)).cat.categories.tolist(),
+        "ordem_gasto": ordenar_faixas(pd.Series(cross_gasto.columns)).cat.categories.tolist(),
+        "gasto_renda": media_por_grupo(df, COL_GASTO, COL_RENDA).round(2),
+        "gasto_cidade": gasto_cidade.nlargest(15, "Respostas").round(2),
+    }
+
+
+def graficos_frequencia_gasto(r: dict) -> dict:
+    return {
+        "freq": (barras, r["freq"], {}),
+        "gasto": (barras, r["gasto"], {}),
+        "calor": (calor, r["calor"], {"x": "Gasto", "y": "Renda",
+                                      "ordem_x": r["ordem_gasto"], "ordem_y": r["ordem_renda"]}),
+    }
+
+
+def desenhar_frequencia_gasto(st, r: dict, e: dict):
+    g = graficos_frequencia_gasto(r)
+    st.header("B) Distribuição de Frequência de compra e faixa de gasto")
+    col1, col2 = st.columns(2)
+    for coluna, chave, titulo in ((col1, "freq", "Frequência de compra"), (col2, "gasto", "Faixa de gasto")):
+        with coluna:
+            st.subheader(titulo)
+            if e["mostrar_tabelas"]:
+                st.dataframe(r[chave], use_container_width=True)
+            _grafico(st, g, chave)
+
+    st.subheader("Gasto mensal x faixa de renda")
+    _grafico(st, g, "calor")
+
+    col3, col4 = st.columns(2)
+    with col3:
+        st.write("Gasto médio estimado por faixa de renda")
+        st.dataframe(r["gasto_renda"], use_container_width=True)
+    with col4:
+        st.write("Gasto médio estimado por cidade (15 com mais respostas)")
+        st.dataframe(r["gasto_cidade"], use_container_width=True)
+
+
+# =============================
+# C) Segunda mão e percepções
+# =============================
+def calcular_segunda_mao(e: dict) -> dict:
+    cubo, selecoes = e["cubo"], e["selecoes"]
+    # Índice e categoria
+    cross = cubo.crosstab(COL_IMPACTO, COL_CIRC, selecoes, normalize="index").round(3) * 100
+    cross = cross.reset_index().rename(columns={COL_IMPACTO: "Percepção de impacto"})
+    # Tendência entre ondas: só os filtros de gênero, idade e renda que o usuário
+    # estreitou são empurrados para a leitura; as opções da barra lateral vêm da
+    # exportação atual e cortariam respostas que só existem em outras ondas
+    ondas, indice = e["ondas"], e["indice"]
+    estreitados = {c: selecoes[c] for c in FILTROS_ONDAS if set(selecoes[c]) != set(indice.categorias(c))}
+    return {
+        "segunda_mao": cubo.vc_table(COL_2MAO, selecoes),
+        "impacto": cross,
+        "impacto_longo": cross.melt(id_vars="Percepção de impacto", var_name="Nível de prática", value_name="%"),
+        "ondas": ondas.tendencia(COL_2MAO, estreitados),
+        "n_ondas": len(ondas.ondas()),
+    }
+
+
+def graficos_segunda_mao(r: dict) -> dict:
+    return {
+        "segunda_mao": (pizza, r["segunda_mao"], {}),
+        "impacto": (barras_agrupadas, r["impacto_longo"], {"x": "Percepção de impacto", "cor": "Nível de prática"}),
+        "ondas": (linhas, r["ondas"], {}),
+    }
+
+
+def desenhar_segunda_mao(st, r: dict, e: dict):
+    g = graficos_segunda_mao(r)
+    st.header("C) Consumo de Segunda Mão e Percepções")
+    if e["mostrar_tabelas"]:
+        st.dataframe(r["segunda_mao"], use_container_width=True)
+    # Pizza (proporções)
+    _grafico(st, g, "segunda_mao")
+
+    if e["mostrar_tabelas"]:
+        st.dataframe(r["impacto"], use_container_width=True)
+    # Barras evidenciando distância entre discurso e ação
+    _grafico(st, g, "impacto")
+
+    st.subheader("Segunda mão ao longo das ondas")
+    if r["n_ondas"] < 2:
+        st.caption("Só há uma onda gravada; novas ondas entram com `python ondas.py <exportação>`.")
+    _grafico(st, g, "ondas")
+
+
+# =============================
+# D) Relação com os ODS
+# =============================
+def calcular_ods(e: dict) -> dict:
+    tb_ods = e["cubo"].vc_table(COL_ODS, e["selecoes"])
+    tb_ods["Categoria"] = tb_ods["Categoria"].astype(str)
+    return {"ods": tb_ods}
+
+
+def graficos_ods(r: dict) -> dict:
+    return {"ods": (colunas, r["ods"], {})}
+
+
+def desenhar_ods(st, r: dict, e: dict):
+    st.header("D) Relação com os ODS")
+    if e["mostrar_tabelas"]:
+        st.dataframe(r["ods"], use_container_width=True)
+    _grafico(st, graficos_ods(r), "ods")
+
+
+# =============================
+# E) Motivação (nuvem de palavras)
+# =============================
+def controles_motivacao(st) -> dict:
+    return {"col_texto": st.selectbox("Pergunta aberta", COLS_TEXTO)}
+
+
+def calcular_motivacao(e: dict) -> dict:
+    # Nuvem e palavras mais citadas nas respostas abertas, respeitando os filtros
+    termos, mascara, col = e["termos"], e["mascara"], e["col_texto"]
+    return {
+        "nuvem": renderizar_nuvem(termos.frequencias(col, mascara)),
+        "termos": termos.top_termos(col, mascara, n=20),
+    }
+
+
+def graficos_motivacao(r: dict) -> dict:
+    return {"termos": (barras, r["termos"], {"x": "Frequência", "y": "Palavra",
+                                             "tooltip": ["Palavra", "Frequência"], "altura": 420})}
+
+
+def desenhar_motivacao(st, r: dict, e: dict):
+    st.header("E) Motivação para escolhas de consumo")
+    if r["nuvem"] is None:
+        st.info("Sem respostas para os filtros selecionados.")
+    else:
+        st.image(r["nuvem"], use_container_width=True)
+    _grafico(st, graficos_motivacao(r), "termos")
+
+
+SECOES = [
+    Secao("perfil", "Perfil", ("selecoes",), calcular_perfil, desenhar_perfil, graficos_perfil),
+    Secao("mapa", "Mapa", ("selecoes",), calcular_mapa, desenhar_mapa, graficos_mapa),
+    Secao("frequencia_gasto", "Frequência e gasto", ("selecoes",), calcular_frequencia_gasto,
+          desenhar_frequencia_gasto, graficos_frequencia_gasto),
+    Secao("segunda_mao", "Segunda mão", ("selecoes", "versao_ondas"), calcular_segunda_mao,
+          desenhar_segunda_mao, graficos_segunda_mao),
+    Secao("ods", "ODS", ("selecoes",), calcular_ods, desenhar_ods, graficos_ods),
+    Secao("motivacao", "Motivação", ("selecoes", "col_texto"), calcular_motivacao, desenhar_motivacao,
+          graficos_motivacao, controles=controles_motivacao),
+]
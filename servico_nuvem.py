@@ -0,0 +1,95 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import pandas as pd
+from wordcloud import WordCloud
+
+# =============================
+# Renderização de nuvens de palavras com cache
+# =============================
+# A nuvem é gerada a partir de um vetor de frequências e o PNG fica num LRU
+# limitado por tamanho. A chave é o hash das frequências + parâmetros, então
+# o mesmo filtro não renderiza de novo e cada combinação nova renderiza uma vez.
+
+PARAMETROS_PADRAO = {"width": 800, "height": 400, "background_color": "white", "colormap": "viridis"}
+LIMITE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class CacheLRU:
+    def __init__(self, limite_bytes=LIMITE_CACHE_BYTES):
+        self.limite_bytes = limite_bytes
+        self.total_bytes = 0
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+    def __len__(self):
+        return len(self._itens)
+
+    def obter(self, chave):
+        with self._trava:
+            if chave not in self._itens:
+                return None
+            self._itens.move_to_end(chave)
+            return self._itens[chave]
+
+    def guardar(self, chave, valor: bytes):
+        with self._trava:
+            if chave in self._itens:
+                self.total_bytes -= len(self._itens.pop(chave))
+            self._itens[chave] = valor
+            self.total_bytes += len(valor)
+            while self.total_bytes > self.limite_bytes and len(self._itens) > 1:
+                _, antigo = self._itens.popitem(last=False)
+                self.total_bytes -= len(antigo)
+
+
+_cache = CacheLRU()
+
+
+def _como_serie(freq) -> pd.Series:
+    s = freq if isinstance(freq, pd.Series) else pd.Series(freq, dtype="int64")
+    return s[s > 0].sort_index()
+
+
+def chave_nuvem(freq, parametros: dict) -> str:
+    s = _como_serie(freq)
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(s, index=True).to_numpy().tobytes())
+    h.update(json.dumps(parametros, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+def renderizar_nuvem(freq, **parametros):
+    """PNG (bytes) da nuvem para as frequências dadas, ou None se não houver palavras."""
+    parametros = {**PARAMETROS_PADRAO, **parametros}
+    s = _como_serie(freq)
+    if s.empty:
+        return None
+    chave = chave_nuvem(s, parametros)
+    png = _cache.obter(chave)
+    if png is not None:
+        return png
+
+    imagem = WordCloud(**parametros).generate_from_frequencies(s.to_dict()).to_image()
+    buffer = BytesIO()
+    imagem.save(buffer, format="PNG")
+    png = buffer.getvalue()
+    _cache.guardar(chave, png)
+    return png
+
+
+def pre_renderizar(frequencias, **parametros) -> threading.Thread:
+    """Renderiza em segundo plano uma lista de vetores de frequência (ex.: um por gênero)."""
+    def _executar():
+        for freq in frequencias:
+            renderizar_nuvem(freq, **parametros)
+
+    thread = threading.Thread(target=_executar, name="pre-render-nuvens", daemon=True)
+    thread.start()
+    return thread
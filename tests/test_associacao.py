@@ -0,0 +1,10 @@
+from associacao import colunas_questionario
+from dados import carregar_base
+
+
+def test_colunas_derivadas_ficam_fora_da_mineracao():
+    df = carregar_base("moda_lilian.csv")
+    df["Cluster"] = 0
+    colunas = colunas_questionario(df)
+    assert "Cluster" not in colunas
+    assert colunas == colunas_questionario(df.drop(columns="Cluster"))
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from circularidade import (
+    build_indice_circularidade, codificar, encode_reforma, encode_segunda_mao, encode_yes_no,
+)
+from colunas import COL_2MAO, COL_MARCA_SUST, COL_REFORMA, COLS_FILTRO
+from dados import carregar_base
+from esquema import tipar
+
+ENCODERS = {COL_REFORMA: encode_reforma, COL_MARCA_SUST: encode_yes_no, COL_2MAO: encode_segunda_mao}
+
+
+@pytest.fixture(scope="module")
+def base():
+    return carregar_base("moda_lilian.csv")
+
+
+def _linha_a_linha(df: pd.DataFrame) -> np.ndarray:
+    # Referência: cada regra aplicada resposta por resposta
+    soma = sum(df[col].astype(object).apply(funcao).to_numpy() for col, funcao in ENCODERS.items())
+    return np.clip(soma, 0, 3)
+
+
+@pytest.mark.parametrize("col", list(ENCODERS))
+def test_codificar_igual_ao_apply(base, col):
+    esperado = base[col].astype(object).apply(ENCODERS[col]).to_numpy()
+    assert np.array_equal(codificar(base[col], ENCODERS[col]), esperado)
+
+
+def test_indice_igual_ao_linha_a_linha(base):
+    esperado = _linha_a_linha(base)
+    assert np.array_equal(build_indice_circularidade(base).to_numpy(), esperado)
+    # Mesma resposta com as colunas já tipadas (categorias do esquema)
+    tipada = tipar(base, list(COLS_FILTRO) + list(ENCODERS))
+    assert np.array_equal(build_indice_circularidade(tipada).to_numpy(), esperado)
+
+
+def test_reforma_so_conta_resposta_afirmativa(base):
+    mapa = {r: encode_reforma(r) for r in base[COL_REFORMA].dropna().unique()}
+    assert mapa["Faço isso sempre que posso"] == 1
+    assert {r for r, v in mapa.items() if v} == {"Faço isso sempre que posso"}
+
+
+def test_ausentes_e_desconhecidas():
+    df = pd.DataFrame({
+        COL_REFORMA: [None, "resposta inédita", "Faço isso sempre que posso", np.nan],
+        COL_MARCA_SUST: ["Sim", None, "talvez", "Não"],
+        COL_2MAO: [None, "algo novo", "Sim, frequentemente", "Nunca"],
+    })
+    for col, funcao in ENCODERS.items():
+        esperado = df[col].astype(object).apply(funcao).to_numpy()
+        assert np.array_equal(codificar(df[col], funcao), esperado)
+    assert np.array_equal(build_indice_circularidade(df).to_numpy(), _linha_a_linha(df))
+    # Coluna ausente conta como nenhuma prática
+    assert np.array_equal(build_indice_circularidade(df.drop(columns=COL_REFORMA)).to_numpy(),
+                          _linha_a_linha(df.assign(**{COL_REFORMA: None})))
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from faixas import interpretar_faixa, ordenar_faixas
+
+
+@pytest.mark.parametrize("txt, esperado", [
+    ("Até R$ 100", (0.0, 100.0, 50.0)),
+    ("Até R$ 1000", (0.0, 1000.0, 500.0)),
+    ("Até R$ 1.000", (0.0, 1000.0, 500.0)),
+    ("De R$ 101 a R$ 300", (101.0, 300.0, 200.5)),
+    ("De R$ 1001 a R$ 3000", (1001.0, 3000.0, 2000.5)),
+    ("De R$ 2.001 a R$ 5.000", (2001.0, 5000.0, 3500.5)),
+    ("De R$ 1.500,50 a R$ 2000", (1500.5, 2000.0, 1750.25)),
+    ("Acima de R$ 10000", (10000.0, np.inf, 15000.0)),
+    ("Acima de R$ 10.000", (10000.0, np.inf, 15000.0)),
+])
+def test_interpretar_faixa(txt, esperado):
+    assert interpretar_faixa(txt) == esperado
+
+
+def test_resposta_que_nao_e_faixa():
+    assert all(np.isnan(interpretar_faixa("Prefiro não dizer")))
+    assert all(np.isnan(interpretar_faixa(None)))
+
+
+def test_ordem_com_e_sem_separador_de_milhar():
+    s = pd.Series(["Acima de R$ 3000", "De R$ 1001 a R$ 3000", "Até R$ 1.000", "Não sei"])
+    assert list(ordenar_faixas(s).cat.categories) == [
+        "Até R$ 1.000", "De R$ 1001 a R$ 3000", "Acima de R$ 3000", "Não sei",
+    ]
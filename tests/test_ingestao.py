@@ -0,0 +1,46 @@
+import threading
+
+import pandas as pd
+
+from dados import COL_DATA, carregar_base
+from ingestao import Armazem
+
+
+def _lote(base: pd.DataFrame, dias: int) -> pd.DataFrame:
+    lote = base.tail(3).copy()
+    lote[COL_DATA] = lote[COL_DATA] + pd.Timedelta(days=dias)
+    return lote
+
+
+def test_armazens_abertos_juntos_nao_se_sobrescrevem(tmp_path):
+    # Dashboard e `ingestao.py --observar` abertos sobre a mesma pasta
+    base = carregar_base("moda_lilian.csv")
+    dashboard, observador = Armazem("moda_lilian.csv", tmp_path), Armazem("moda_lilian.csv", tmp_path)
+    dashboard.acrescentar(_lote(base, 400))
+    observador.acrescentar(_lote(base, 800))
+
+    partes = Armazem("moda_lilian.csv", tmp_path).estado["partes"]
+    assert partes == ["parte-000000.parquet", "parte-000001.parquet", "parte-000002.parquet"]
+    assert len(Armazem("moda_lilian.csv", tmp_path).ler()) == len(base) + 6
+
+
+def test_gravacoes_simultaneas(tmp_path):
+    base = carregar_base("moda_lilian.csv")
+    armazens = [Armazem("moda_lilian.csv", tmp_path) for _ in range(4)]
+    threads = [threading.Thread(target=a.acrescentar, args=(_lote(base, 400 * (i + 1)),)) for i, a in enumerate(armazens)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    partes = Armazem("moda_lilian.csv", tmp_path).estado["partes"]
+    assert sorted(p.name for p in (tmp_path / "moda_lilian").glob("parte-*.parquet")) == partes
+
+
+def test_ler_ve_partes_de_outro_armazem(tmp_path):
+    base = carregar_base("moda_lilian.csv")
+    dashboard = Armazem("moda_lilian.csv", tmp_path)
+    partes = len(dashboard.estado["partes"])
+    Armazem("moda_lilian.csv", tmp_path).acrescentar(_lote(base, 400))
+
+    assert len(dashboard.ler(partes)) == 3
@@ -0,0 +1,19 @@
+import pandas as pd
+
+from mapa import mapa_cidades
+
+
+def _cidades(freq) -> pd.DataFrame:
+    return pd.DataFrame({
+        "Cidade_Normalizada": ["Adamantina", "Osvaldo Cruz"],
+        "UF": ["SP", "SP"],
+        "Frequência": freq,
+        "Lat": [-21.68, -21.8],
+        "Lon": [-51.07, -50.88],
+    })
+
+
+def test_mesmo_agregado_reaproveita_o_mapa():
+    # Filtros diferentes podem chegar às mesmas contagens por cidade
+    assert mapa_cidades(_cidades([12, 3])) is mapa_cidades(_cidades([12, 3]))
+    assert mapa_cidades(_cidades([12, 3])) is not mapa_cidades(_cidades([12, 4]))
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from colunas import COL_2MAO, COL_GENERO, COL_IDADE, COL_RENDA
+from dados import COL_DATA, carregar_base
+from ondas import ArmazemOndas
+
+
+def _base() -> pd.DataFrame:
+    return pd.DataFrame({
+        COL_DATA: pd.to_datetime(["2025-03-01 10:00", "2025-03-02 11:00", "2025-03-02 12:00"]),
+        COL_GENERO: ["Feminino", "Masculino", "Feminino"],
+        COL_IDADE: ["18 a 24 anos", "25 a 34 anos", "18 a 24 anos"],
+        COL_RENDA: ["Até R$ 2.000", "Até R$ 2.000", "De R$ 2.001 a R$ 5.000"],
+        COL_2MAO: ["Nunca", "Às vezes", "Frequentemente"],
+    })
+
+
+def test_filtro_vazio_nao_le_nada(tmp_path):
+    armazem = ArmazemOndas(tmp_path)
+    armazem.adicionar(_base(), "2025-S1")
+    selecoes = {COL_GENERO: [], COL_IDADE: ["18 a 24 anos"], COL_RENDA: ["Até R$ 2.000"]}
+
+    assert armazem.ler([COL_2MAO], selecoes).empty
+    tendencia = armazem.tendencia(COL_2MAO, selecoes)
+    assert tendencia.empty
+    assert list(tendencia.columns) == ["Onda", "Categoria", "Contagem", "%"]
+
+
+def test_filtro_igual_ao_pandas(tmp_path):
+    armazem = ArmazemOndas(tmp_path)
+    armazem.adicionar(_base(), "2025-S1")
+    lido = armazem.ler([COL_2MAO], {COL_GENERO: ["Feminino"]})
+    assert sorted(lido[COL_2MAO]) == ["Frequentemente", "Nunca"]
+
+
+def test_reexportacao_com_outro_rotulo_remove_onda_anterior(tmp_path):
+    armazem = ArmazemOndas(tmp_path)
+    armazem.registrar("moda_lilian.csv", "2025-S1")
+    armazem.registrar("moda_lilian.csv", "2025-S2")
+
+    assert armazem.ondas() == ["2025-S2"]
+    assert len(armazem.ler([COL_2MAO])) == len(carregar_base("moda_lilian.csv"))
+
+
+def test_rotulo_de_outro_arquivo_exige_substituir(tmp_path):
+    armazem = ArmazemOndas(tmp_path)
+    armazem.registrar("moda.xlsx", "2025-S1")
+    with pytest.raises(ValueError, match="moda.xlsx"):
+        armazem.registrar("moda_lilian.csv", "2025-S1")
+    assert len(armazem.ler([COL_2MAO])) == len(carregar_base("moda.xlsx"))
+
+    armazem.registrar("moda_lilian.csv", "2025-S1", substituir=True)
+    assert list(armazem.registro()) == ["moda_lilian.csv"]
+    assert len(armazem.ler([COL_2MAO])) == len(carregar_base("moda_lilian.csv"))
+
+
+def _incremental(df, versao):
+    # Só o que registrar usa de ingestao.BaseIncremental
+    return SimpleNamespace(versao=versao, armazem=SimpleNamespace(ler=lambda: df))
+
+
+def test_respostas_acrescentadas_entram_na_onda(tmp_path):
+    armazem = ArmazemOndas(tmp_path)
+    base = _base()
+    armazem.registrar("moda_lilian.csv", "2025-S1", incremental=_incremental(base.iloc[:2], "v1"))
+    armazem.registrar("moda_lilian.csv", "2025-S1", incremental=_incremental(base, "v2"))
+    assert armazem.tendencia(COL_2MAO)["Contagem"].sum() == 3
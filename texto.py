@@ -0,0 +1,51 @@
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from colunas import COL_TXT_CONSCIENTE, COL_TXT_MARCAS, COL_TXT_MOTIVA
+
+# =============================
+# Processamento de texto das perguntas abertas
+# =============================
+# Cada resposta é tokenizada uma única vez (regex pré-compilada, cache LRU
+# limitado por texto) numa tabela longa de tokens; as frequências saem da matriz
+# documento-termo montada a partir dela (matriz_termos.py).
+# As stopwords (lista do NLTK para português) ficam no repositório, sem download.
+
+ARQ_STOPWORDS = Path("stopwords_pt.txt")
+MAX_TEXTOS_CACHE = 2**16  # limita a memória do cache de tokens em processos longos
+_RE_PONTUACAO = re.compile(r'[^a-zA-ZÀ-ÿ\s]')
+
+# Palavras removidas de cada coluna
+PALAVRAS_EXCLUIR = {
+    COL_TXT_MOTIVA: ['roupas', 'comprar', 'ex', 'promoção'],
+    COL_TXT_CONSCIENTE: ['consumidor', 'consumidora', 'porque'],
+    COL_TXT_MARCAS: ['roupas', 'comprar', 'marcas', 'gosto', 'marca', 'compro', 'preferência', 'ligo',
+                     'qualidade', 'bem', 'específica', 'roupa', 'sei', 'uso', 'sim'],
+}
+
+
+@lru_cache(maxsize=1)
+def carregar_stopwords(caminho=ARQ_STOPWORDS) -> frozenset:
+    return frozenset(Path(caminho).read_text(encoding="utf-8").split())
+
+
+@lru_cache(maxsize=MAX_TEXTOS_CACHE)
+def tokenizar(texto: str) -> tuple:
+    stop_words = carregar_stopwords()
+    texto = _RE_PONTUACAO.sub('', texto.lower())  # Remover pontuações
+    return tuple(w for w in texto.split() if w not in stop_words)
+
+
+def tabela_tokens(df: pd.DataFrame, coluna: str, grupos=()) -> pd.DataFrame:
+    """Uma linha por (resposta, palavra), com as colunas de grupo pedidas."""
+    grupos = list(grupos)
+    respostas = df[coluna].dropna().astype(str)
+    longa = df.loc[respostas.index, grupos].copy()
+    longa["Palavra"] = respostas.map(tokenizar)
+    longa = longa.explode("Palavra").dropna(subset=["Palavra"])
+    excluir = PALAVRAS_EXCLUIR.get(coluna, [])
+    return longa[~longa["Palavra"].isin(excluir)]
+